@@ -1,6 +1,6 @@
 import asyncio
-import json
-import base64
+import orjson
+import pybase64
 import os
 
 # Import Google Generative AI components
@@ -23,11 +23,18 @@ from config import (
     VOICE_NAME,
     SEND_SAMPLE_RATE,
     SYSTEM_INSTRUCTION,
+    AUDIO_FRAME_TAG,
+    get_runner,
+    queued_logging,
 )
 
 # Initialize Google client
 client = genai.Client(vertexai=True, project=PROJECT_ID, location=LOCATION)
 
+# Size of the reused buffer that coalesces queued audio frames (1s of 16-bit PCM)
+AUDIO_ARENA_BYTES = SEND_SAMPLE_RATE * 2
+AUDIO_MIME = f"audio/pcm;rate={SEND_SAMPLE_RATE}"
+
 tools = [{'google_search': {}}]
 
 
@@ -36,8 +43,8 @@ tools = [{'google_search': {}}]
 # finished for a while.
 def load_previous_session_handle():
     try:
-        with open('session_handle.json', 'r') as f:
-            data = json.load(f)
+        with open('session_handle.json', 'rb') as f:
+            data = orjson.loads(f.read())
             print(f"Loaded previous session handle: {data.get('previous_session_handle', None)}")
             return data.get('previous_session_handle', None)
     except FileNotFoundError:
@@ -45,11 +52,16 @@ def load_previous_session_handle():
 
 # Save previous session handle to a file
 def save_previous_session_handle(handle):
-    with open('session_handle.json', 'w') as f:
-        json.dump({'previous_session_handle': handle}, f)
+    # Write a temp file and swap it in, so a crash mid-write never leaves a truncated handle file
+    with open('session_handle.json.tmp', 'wb') as f:
+        f.write(orjson.dumps({'previous_session_handle': handle}))
+    os.replace('session_handle.json.tmp', 'session_handle.json')
 
 previous_session_handle = load_previous_session_handle()
 
+# Seconds to wait before saving a new session handle (later handles in that window replace it)
+HANDLE_SAVE_DELAY = 1.0
+
 
 CONFIG = {
     "response_modalities": ["AUDIO"], 
@@ -76,16 +88,67 @@ CONFIG = {
     ),
 }
 
+# Validate the config once instead of on every connect; the resumption handle
+# is updated in place when Gemini issues a new one
+LIVE_CONFIG = types.LiveConnectConfig(**CONFIG)
+
+
+# Pre-serialized JSON envelopes: fixed messages are encoded once, and for the
+# others only the payload is encoded per message (prefix + orjson.dumps(data) + b"}")
+INTERRUPTED_EVENT = orjson.dumps({"type": "interrupted", "data": "Response interrupted by user input"})
+TURN_COMPLETE_EVENT = orjson.dumps({"type": "turn_complete"})
+SESSION_ID_PREFIX = b'{"type":"session_id","data":'
+ITEXT_PREFIX = b'{"type":"itext","data":'
+OTEXT_PREFIX = b'{"type":"otext","data":'
+BATCH_PREFIX = b'{"type":"batch","items":['
+
+
+async def send_events(websocket, events):
+    """Send the serialized messages produced by one model response as a single frame"""
+    if len(events) == 1:
+        await websocket.send(events[0].decode())
+    elif events:
+        await websocket.send((BATCH_PREFIX + b",".join(events) + b"]}").decode())
+
 
 class LiveAPIWebSocketServer(BaseWebSocketServer):
     """WebSocket server implementation using Gemini LiveAPI directly."""
 
+    def __init__(self, host="0.0.0.0", port=8765):
+        super().__init__(host, port)
+        self._last_handle = previous_session_handle  # Latest resumption handle (already on disk)
+        self._unsaved_handle = None                   # Newer handle waiting to be written
+        self._handle_flush_task = None
+
+    def remember_session_handle(self, handle):
+        """Keep the latest resumption handle and save it off the event loop (repeats are skipped)"""
+        if handle == self._last_handle:
+            return
+        self._last_handle = self._unsaved_handle = handle
+        LIVE_CONFIG.session_resumption.handle = handle  # New connections resume the latest session
+        if self._handle_flush_task is None:
+            self._handle_flush_task = asyncio.create_task(self._flush_session_handle())
+
+    async def _flush_session_handle(self):
+        """Write pending handles one at a time; only the newest one is written if several queue up"""
+        try:
+            # Debounce: handles issued in a burst collapse into a single write
+            await asyncio.sleep(HANDLE_SAVE_DELAY)
+            while self._unsaved_handle is not None:
+                handle, self._unsaved_handle = self._unsaved_handle, None
+                try:
+                    await asyncio.to_thread(save_previous_session_handle, handle)
+                except OSError as e:
+                    logger.error(f"Failed to save session handle: {e}")
+        finally:
+            self._handle_flush_task = None
+
     async def process_audio(self, websocket, client_id):
         # Store reference to client
         self.active_clients[client_id] = websocket
 
         # Connect to Gemini using LiveAPI
-        async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
+        async with client.aio.live.connect(model=MODEL, config=LIVE_CONFIG) as session:
             # Track if we've already handled the initial session setup
             session_initialized = False
             
@@ -97,10 +160,16 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                 async def handle_websocket_messages():
                     async for message in websocket:
                         try:
-                            data = json.loads(message)
+                            # Binary frames carry tagged raw PCM - no base64 or JSON to decode
+                            if isinstance(message, bytes):
+                                if message[:1] == AUDIO_FRAME_TAG:
+                                    await audio_queue.put(message[1:])
+                                continue
+                            
+                            data = orjson.loads(message)
                             if data.get("type") == "audio":
-                                # Decode base64 audio data
-                                audio_bytes = base64.b64decode(data.get("data", ""))
+                                # Older clients send base64 audio in JSON (pybase64 uses SIMD when the CPU supports it)
+                                audio_bytes = pybase64.b64decode(data.get("data", ""), validate=False)
                                 # Put audio in queue for processing
                                 await audio_queue.put(audio_bytes)
                             elif data.get("type") == "end":
@@ -109,23 +178,38 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                             elif data.get("type") == "text":
                                 # Handle text messages (not implemented in this simple version)
                                 logger.info(f"Received text: {data.get('data')}")
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             logger.error("Invalid JSON message received")
                         except Exception as e:
                             logger.error(f"Error processing message: {e}")
 
                 # Task to process and send audio to Gemini
                 async def process_and_send_audio():
+                    # Reused staging buffer: frames that queued up while the previous send
+                    # was in flight are copied into it and sent to Gemini as one chunk
+                    arena = memoryview(bytearray(AUDIO_ARENA_BYTES))
+                    pending = None  # Frame that did not fit in the last batch
                     while True:
-                        data = await audio_queue.get()
+                        data = pending if pending is not None else await audio_queue.get()
+                        pending = None
 
-                        # Send the audio data to Gemini
-                        await session.send(input={
-                            "mime_type": f"audio/pcm;rate={SEND_SAMPLE_RATE}",
-                            "data": data
-                        })
+                        if not audio_queue.empty() and len(data) < AUDIO_ARENA_BYTES:
+                            used = len(data)
+                            arena[:used] = data
+                            while not audio_queue.empty():
+                                frame = audio_queue.get_nowait()
+                                end = used + len(frame)
+                                if end > AUDIO_ARENA_BYTES:
+                                    pending = frame
+                                    break
+                                arena[used:end] = frame
+                                used = end
+                            data = bytes(arena[:used])
 
-                        audio_queue.task_done()
+                        # Send the audio data to Gemini (model_construct skips re-validating known-good fields)
+                        await session.send_realtime_input(
+                            audio=types.Blob.model_construct(data=data, mime_type=AUDIO_MIME)
+                        )
 
                 # Task to receive and play responses
                 async def receive_and_play():
@@ -136,21 +220,31 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                         output_transcriptions = []
 
                         async for response in session.receive():
+                            # JSON messages for the client from this response, sent as one frame
+                            events = []
+
+                            # Resolve the response fields once; everything below uses these locals
+                            server_content = response.server_content
+                            if server_content:
+                                model_turn = server_content.model_turn
+                                output_transcription = server_content.output_transcription
+                                input_transcription = server_content.input_transcription
+                                interrupted = server_content.interrupted
+                                turn_complete = server_content.turn_complete
+                            else:
+                                model_turn = output_transcription = input_transcription = None
+                                interrupted = turn_complete = False
+
                             # Handle session resumption update - log only on initial connection, but save every time
-                            if response.session_resumption_update:
-                                update = response.session_resumption_update
+                            if update := response.session_resumption_update:
                                 if update.resumable and update.new_handle:
-                                    # Always save the updated handle
-                                    save_previous_session_handle(update.new_handle)
+                                    # Always save the updated handle (in the background)
+                                    self.remember_session_handle(update.new_handle)
                                     
                                     if not session_initialized:
                                         logger.info(f"Session established with handle: {update.new_handle}")
                                         # Send session ID to client
-                                        session_id_msg = json.dumps({
-                                            "type": "session_id",
-                                            "data": update.new_handle
-                                        })
-                                        await websocket.send(session_id_msg)
+                                        events.append(SESSION_ID_PREFIX + orjson.dumps(update.new_handle) + b"}")
                                         session_initialized = True
                                     else:
                                         # Print session handle updates after initial connection
@@ -160,51 +254,34 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                             if response.go_away is not None:
                                 logger.info(f"Session will terminate in: {response.go_away.time_left}")
 
-                            server_content = response.server_content
-
                             # Handle interruption
-                            if (hasattr(server_content, "interrupted") and server_content.interrupted):
+                            if interrupted:
                                 logger.info("🤐 INTERRUPTION DETECTED")
                                 # Just notify the client - no need to handle audio on server side
-                                await websocket.send(json.dumps({
-                                    "type": "interrupted",
-                                    "data": "Response interrupted by user input"
-                                }))
+                                events.append(INTERRUPTED_EVENT)
 
                             # Process model response
-                            if server_content and server_content.model_turn:
-                                for part in server_content.model_turn.parts:
+                            if model_turn:
+                                for part in model_turn.parts:
                                     if part.inline_data:
-                                        # Send audio to client only (don't play locally)
-                                        b64_audio = base64.b64encode(part.inline_data.data).decode('utf-8')
-                                        await websocket.send(json.dumps({
-                                            "type": "audio",
-                                            "data": b64_audio
-                                        }))
+                                        # Send raw PCM to client as a tagged binary frame (no base64/JSON)
+                                        await websocket.send(AUDIO_FRAME_TAG + part.inline_data.data)
 
                             # Handle turn completion
-                            if server_content and server_content.turn_complete:
+                            if turn_complete:
                                 logger.info("✅ Gemini done talking")
-                                await websocket.send(json.dumps({
-                                    "type": "turn_complete"
-                                }))
+                                events.append(TURN_COMPLETE_EVENT)
 
                             # Handle transcriptions
-                            input_transcription = getattr(response.server_content, "input_transcription", None)
                             if input_transcription and input_transcription.text:
                                 input_transcriptions.append(input_transcription.text)
-                                await websocket.send(json.dumps({
-                                    "type": "itext",
-                                    "data": input_transcription.text
-                                }))
-                            output_transcription = getattr(response.server_content, "output_transcription", None)
+                                events.append(ITEXT_PREFIX + orjson.dumps(input_transcription.text) + b"}")
                             if output_transcription and output_transcription.text:
                                 output_transcriptions.append(output_transcription.text)
                                 # Send text to client
-                                await websocket.send(json.dumps({
-                                    "type": "otext",
-                                    "data": output_transcription.text
-                                }))
+                                events.append(OTEXT_PREFIX + orjson.dumps(output_transcription.text) + b"}")
+
+                            await send_events(websocket, events)
 
                         logger.info(f"Input transcription: {''.join(input_transcriptions)}")
                         logger.info(f"Output transcription: {''.join(output_transcriptions)}")
@@ -218,11 +295,13 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
 async def main():
     """Main function to start the server"""
     server = LiveAPIWebSocketServer()
-    await server.start()
+    # Log records are written by a listener thread while the server runs
+    with queued_logging():
+        await server.start()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        get_runner()(main())
     except KeyboardInterrupt:
         logger.info("Exiting application via KeyboardInterrupt...")
     except Exception as e:
@@ -1,16 +1,22 @@
 import asyncio
-import json
-import base64
+import functools
+import inspect
+import logging
+import orjson
+import pybase64
 import os
+import random
 import time
+from dataclasses import dataclass
+
+# Interval timing uses the integer monotonic clock (not subject to NTP adjustments)
+_now = time.monotonic_ns
 
 # Record program start time
-PROGRAM_START_TIME = time.time()
-print(f"🚀 PROGRAM STARTED at {PROGRAM_START_TIME:.3f}")
+PROGRAM_START_TIME = _now()  # Base for startup durations (not wall-clock time)
+print(f"🚀 PROGRAM STARTED at {time.time():.3f}")
 
-# Import Google Generative AI components
-print("🔧 Initializing Google Generative AI client...")
-client_init_start = time.time()
+# Import Google Generative AI components (types is needed at import time for LIVE_CONFIG)
 from google import genai
 from google.genai import types
 from google.genai.types import (
@@ -31,11 +37,18 @@ from common import (
     SEND_SAMPLE_RATE,
     SYSTEM_INSTRUCTION,
 )
-
-# Initialize Google client
-client = genai.Client(vertexai=True, project=PROJECT_ID, location=LOCATION)
-client_init_time = (time.time() - client_init_start) * 1000
-print(f"✅ Google client initialized in {client_init_time:.2f}ms")
+# The binary framing tag and get_runner are defined next to the eval servers' settings (as democode/server.py imports them)
+from config import AUDIO_FRAME_TAG, get_runner
+
+# Google client, created on first use: loading credentials is the slow part of startup
+@functools.lru_cache(maxsize=1)
+def get_client():
+    print("🔧 Initializing Google Generative AI client...")
+    client_init_start = _now()
+    client = genai.Client(vertexai=True, project=PROJECT_ID, location=LOCATION)
+    client_init_time = (_now() - client_init_start) / 1e6
+    print(f"✅ Google client initialized in {client_init_time:.2f}ms")
+    return client
 
 #model = "gemini-2.5-flash-preview-native-audio-dialog"
 
@@ -72,39 +85,38 @@ pause_for_10_seconds = {
 }
 
 
-# Backend dummy functions that actually execute
-async def execute_turn_on_lights():
+# Backend dummy functions that actually execute (plain functions unless they really await something)
+def execute_turn_on_lights():
     """Backend function to turn on lights"""
-    tool_start = time.time()
+    tool_start = _now()
     print("----- Turned on Successfull")
-    execution_time = (time.time() - tool_start) * 1000
+    execution_time = (_now() - tool_start) / 1e6
     print(f"💡 Light control executed in {execution_time:.2f}ms")
     return {"result": "Lights turned on successfully", "status": "on"}
 
-async def execute_turn_off_lights():
+def execute_turn_off_lights():
     """Backend function to turn off lights"""
-    tool_start = time.time()
+    tool_start = _now()
     print("Turned off Successfull -----")
-    execution_time = (time.time() - tool_start) * 1000
+    execution_time = (_now() - tool_start) / 1e6
     print(f"💡 Light control executed in {execution_time:.2f}ms")
     return {"result": "Lights turned off successfully", "status": "off"}
 
-async def execute_get_weather(location="Unknown"):
+def execute_get_weather(location="Unknown"):
     """Backend function to get weather"""
-    tool_start = time.time()
+    tool_start = _now()
     print(f"Fetching weather for: {location}")
-    import random
     temperature = random.randint(60, 85)
     conditions = random.choice(["sunny", "cloudy", "partly cloudy", "rainy"])
     result = f"Current weather in {location}: {temperature}°F, {conditions}"
-    execution_time = (time.time() - tool_start) * 1000
+    execution_time = (_now() - tool_start) / 1e6
     print(f"🌤️ Weather API executed in {execution_time:.2f}ms")
     print(f"Weather result: {result}")
     return {"result": result, "temperature": temperature, "conditions": conditions}
 
 async def execute_pause():
     """Backend function to simulate a slow API call that takes 10 seconds"""
-    tool_start = time.time()
+    tool_start = _now()
     print("🌐 Making API call to external service...")
     print("📡 Connecting to slow-response-api.example.com...")
     
@@ -119,7 +131,7 @@ async def execute_pause():
     print("📊 Analyzing response data...")
     
     await asyncio.sleep(2)
-    execution_time = (time.time() - tool_start) * 1000
+    execution_time = (_now() - tool_start) / 1e6
     print(f"🐌 Slow API call executed in {execution_time:.2f}ms")
     print("✅ API call completed successfully!")
     
@@ -135,6 +147,24 @@ async def execute_pause():
         }
     }
 
+# Backend function for each tool, the (argument, default) pairs it is called with, and whether
+# it is a coroutine function (checked once, so synchronous tools are called without a coroutine)
+TOOL_DISPATCH = {
+    name: (backend, arg_defaults, inspect.iscoroutinefunction(backend))
+    for name, backend, arg_defaults in (
+        ("turn_on_the_lights", execute_turn_on_lights, ()),
+        ("turn_off_the_lights", execute_turn_off_lights, ()),
+        ("get_weather", execute_get_weather, (("location", "Unknown Location"),)),
+        ("pause_for_10_seconds", execute_pause, ()),
+    )
+}
+
+# Most client audio frames waiting for Gemini; beyond this the oldest are dropped
+AUDIO_QUEUE_MAX = 32
+# Size of the reused buffer that coalesces queued audio frames (1s of 16-bit PCM)
+AUDIO_ARENA_BYTES = SEND_SAMPLE_RATE * 2
+AUDIO_MIME = f"audio/pcm;rate={SEND_SAMPLE_RATE}"
+
 # Combined tools configuration
 tools = [
     {"google_search": {}},  # Google Search tool
@@ -149,8 +179,8 @@ tools = [
 # Load previous session handle from a file
 def load_previous_session_handle():
     try:
-        with open('session_handle.json', 'r') as f:
-            data = json.load(f)
+        with open('session_handle.json', 'rb') as f:
+            data = orjson.loads(f.read())
             print(f"Loaded previous session handle: {data.get('previous_session_handle', None)}")
             return data.get('previous_session_handle', None)
     except FileNotFoundError:
@@ -158,11 +188,16 @@ def load_previous_session_handle():
 
 # Save previous session handle to a file
 def save_previous_session_handle(handle):
-    with open('session_handle.json', 'w') as f:
-        json.dump({'previous_session_handle': handle}, f)
+    # Write a temp file and swap it in, so a crash mid-write never leaves a truncated handle file
+    with open('session_handle.json.tmp', 'wb') as f:
+        f.write(orjson.dumps({'previous_session_handle': handle}))
+    os.replace('session_handle.json.tmp', 'session_handle.json')
 
 previous_session_handle = load_previous_session_handle()
 
+# Seconds to wait before saving a new session handle (later handles in that window replace it)
+HANDLE_SAVE_DELAY = 1.0
+
 CONFIG = {
     "response_modalities": ["AUDIO"], 
     "tools": tools,
@@ -185,261 +220,396 @@ CONFIG = {
     ),
 }
 
+# Validate the config once instead of on every connect; the resumption handle
+# is updated in place when Gemini issues a new one
+LIVE_CONFIG = types.LiveConnectConfig(**CONFIG)
+
+
+# Pre-serialized JSON envelopes: fixed messages are encoded once, and for the
+# others only the payload is encoded per message (prefix + orjson.dumps(data) + b"}")
+INTERRUPTED_EVENT = orjson.dumps({"type": "interrupted", "data": "Response interrupted by user input"})
+TURN_COMPLETE_EVENT = orjson.dumps({"type": "turn_complete"})
+SESSION_ID_PREFIX = b'{"type":"session_id","data":'
+ITEXT_PREFIX = b'{"type":"itext","data":'
+OTEXT_PREFIX = b'{"type":"otext","data":'
+BATCH_PREFIX = b'{"type":"batch","items":['
+
+# Outgoing audio coalescing: after the first chunk of a run, chunks arriving within
+# this window are concatenated into one binary frame (at most AUDIO_BATCH_MAX chunks)
+AUDIO_BATCH_WINDOW = 0.02  # seconds
+AUDIO_BATCH_MAX = 8
+
+
+def events_frame(events):
+    """Join the serialized messages produced by one model response into a single text frame"""
+    if len(events) == 1:
+        return events[0].decode()
+    return (BATCH_PREFIX + b",".join(events) + b"]}").decode()
+
+
+async def websocket_writer(websocket, out_queue):
+    """Send queued client messages in order: bytes are raw PCM chunks, a list holds serialized JSON events"""
+    loop = asyncio.get_running_loop()
+    streaming = False  # Whether the previous frame was audio
+    pending = None     # Item taken from the queue that belongs to the next frame
+    while True:
+        item = pending if pending is not None else await out_queue.get()
+        pending = None
+        
+        if isinstance(item, list):
+            # Events from responses that queued up back to back (e.g. transcript fragments) share one frame
+            events = item
+            while not out_queue.empty():
+                item = out_queue.get_nowait()
+                if not isinstance(item, list):
+                    pending = item
+                    break
+                events += item
+            await websocket.send(events_frame(events))
+            streaming = False
+            continue
+        
+        if not streaming:
+            # First chunk of a response goes out right away so time to first audio is unchanged
+            await websocket.send(AUDIO_FRAME_TAG + item)
+            streaming = True
+            continue
+        
+        # Collect the chunks that follow within the window into one frame
+        chunks = [item]
+        deadline = loop.time() + AUDIO_BATCH_WINDOW
+        while len(chunks) < AUDIO_BATCH_MAX:
+            if out_queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(out_queue.get(), timeout)
+                except TimeoutError:
+                    break
+            else:
+                item = out_queue.get_nowait()
+            if isinstance(item, list):
+                # Events end the batch early (turn_complete, interrupted, ...) and are sent next
+                pending = item
+                break
+            chunks.append(item)
+        
+        await websocket.send(AUDIO_FRAME_TAG + b"".join(chunks))
+
+
+@dataclass(slots=True)
+class TurnState:
+    """Per-connection TTFT tracking shared by the receive and send tasks"""
+    start_ns: int | None = None        # When the user finished speaking (monotonic ns)
+    first_token: bool = False          # Whether the first model token of the turn arrived
+    count: int = 0                     # Turns seen on this connection
+    last_audio_ns: int | None = None   # When the last user audio chunk arrived
+    session_initialized: bool = False  # Whether the session id was sent to the client
+
 
 class LiveAPIWebSocketServer(BaseWebSocketServer):
     """WebSocket server implementation using Gemini LiveAPI directly."""
 
+    def __init__(self, host="0.0.0.0", port=8765):
+        super().__init__(host, port)
+        self._last_handle = previous_session_handle  # Latest resumption handle (already on disk)
+        self._unsaved_handle = None                   # Newer handle waiting to be written
+        self._handle_flush_task = None
+
+    def remember_session_handle(self, handle):
+        """Keep the latest resumption handle and save it off the event loop (repeats are skipped)"""
+        if handle == self._last_handle:
+            return
+        self._last_handle = self._unsaved_handle = handle
+        LIVE_CONFIG.session_resumption.handle = handle  # New connections resume the latest session
+        if self._handle_flush_task is None:
+            self._handle_flush_task = asyncio.create_task(self._flush_session_handle())
+
+    async def _flush_session_handle(self):
+        """Write pending handles one at a time; only the newest one is written if several queue up"""
+        try:
+            # Debounce: handles issued in a burst collapse into a single write
+            await asyncio.sleep(HANDLE_SAVE_DELAY)
+            while self._unsaved_handle is not None:
+                handle, self._unsaved_handle = self._unsaved_handle, None
+                try:
+                    await asyncio.to_thread(save_previous_session_handle, handle)
+                except OSError as e:
+                    logger.error(f"Failed to save session handle: {e}")
+        finally:
+            self._handle_flush_task = None
+
+    def handle_control_message(self, response, state, events):
+        """Handle the messages that arrive without server content (resumption handles, go-away notices)"""
+        # Handle session resumption update - log only on initial connection, but save every time
+        if update := response.session_resumption_update:
+            if update.resumable and update.new_handle:
+                # Always save the updated handle (in the background)
+                self.remember_session_handle(update.new_handle)
+                
+                if not state.session_initialized:
+                    logger.info(f"Session established with handle: {update.new_handle}")
+                    # Send session ID to client
+                    events.append(SESSION_ID_PREFIX + orjson.dumps(update.new_handle) + b"}")
+                    state.session_initialized = True
+                else:
+                    # Print session handle updates after initial connection
+                    logger.info(f"Session handle updated: {update.new_handle}")
+
+        # Check if connection will be terminated soon
+        if response.go_away is not None:
+            logger.info(f"Session will terminate in: {response.go_away.time_left}")
+
     async def handle_tool_calls(self, response):
         """Handle tool calls from the Gemini model - based on reference implementation"""
         if response.tool_call:
-            tool_call_start = time.time()
-            function_responses = []
+            tool_call_start = _now()
             
             print(f"\n🔧 Processing {len(response.tool_call.function_calls)} tool call(s)")
             
-            for fc in response.tool_call.function_calls:
-                func_start = time.time()
+            async def run_tool(fc):
+                func_start = _now()
                 print(f"🛠️ Executing tool: {fc.name}")
                 
                 # Execute actual backend functions for each tool call
-                if fc.name == "turn_on_the_lights":
-                    response_data = await execute_turn_on_lights()
-                elif fc.name == "turn_off_the_lights":
-                    response_data = await execute_turn_off_lights()
-                elif fc.name == "get_weather":
-                    # Extract location parameter if provided
-                    location = "Unknown Location"  # Default
-                    if hasattr(fc, 'args') and fc.args and 'location' in fc.args:
-                        location = fc.args['location']
-                    response_data = await execute_get_weather(location)
-                elif fc.name == "pause_for_10_seconds":
-                    response_data = await execute_pause()
-                    # Add scheduling parameter for NON_BLOCKING function
-                    #response_data["scheduling"] = "INTERRUPT"  # Can also be "WHEN_IDLE" or "SILENT"
+                tool = TOOL_DISPATCH.get(fc.name)
+                if tool:
+                    backend, arg_defaults, is_async = tool
+                    args = fc.args or {}
+                    response_data = backend(*(args.get(key, default) for key, default in arg_defaults))
+                    if is_async:
+                        response_data = await response_data
                 else:
                     print(f"Unknown function: {fc.name}")
                     response_data = {"result": "Function executed successfully"}
                 
-                func_time = (time.time() - func_start) * 1000
+                func_time = (_now() - func_start) / 1e6
                 print(f"✅ Tool {fc.name} completed in {func_time:.2f}ms")
                 
-                function_response = types.FunctionResponse(
+                return types.FunctionResponse(
                     id=fc.id,
                     name=fc.name,
                     response=response_data
                 )
-                function_responses.append(function_response)
+
+            # The calls are independent, so run them concurrently (results keep call order)
+            function_responses = await asyncio.gather(
+                *(run_tool(fc) for fc in response.tool_call.function_calls)
+            )
 
             # Send tool responses back to the session
             await self.session.send_tool_response(function_responses=function_responses)
             
-            total_tool_time = (time.time() - tool_call_start) * 1000
+            total_tool_time = (_now() - tool_call_start) / 1e6
             print(f"🔧 All tool calls completed in {total_tool_time:.2f}ms")
 
     async def process_audio(self, websocket, client_id):
         # Calculate and display startup metrics on first connection
-        connection_time = time.time()
-        startup_time = (connection_time - PROGRAM_START_TIME) * 1000
+        startup_time = (_now() - PROGRAM_START_TIME) / 1e6
         print(f"🔌 WEBSOCKET READY! Total startup time: {startup_time:.2f}ms")
         
-        # TTFT tracking variables
-        last_audio_time = None
-        turn_start_time = None
-        first_token_received = False
-        turn_count = 0
+        # TTFT tracking, shared by the tasks below
+        state = TurnState()
         
         # Store reference to client
         self.active_clients[client_id] = websocket
 
         # Connect to Gemini using LiveAPI
-        async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
+        async with get_client().aio.live.connect(model=MODEL, config=LIVE_CONFIG) as session:
             # Store session reference for tool calls
             self.session = session
             
-            # Track if we've already handled the initial session setup
-            session_initialized = False
-            
             async with asyncio.TaskGroup() as tg:
                 # Create a queue for audio data from the client
-                audio_queue = asyncio.Queue()
+                audio_queue = asyncio.Queue(maxsize=AUDIO_QUEUE_MAX)
+
+                def queue_audio(audio_bytes):
+                    """Queue user audio for Gemini, dropping the oldest frame if the queue is full"""
+                    try:
+                        audio_queue.put_nowait(audio_bytes)
+                    except asyncio.QueueFull:
+                        # Stale audio only adds latency, so the newest frame wins
+                        audio_queue.get_nowait()
+                        audio_queue.put_nowait(audio_bytes)
+                        logger.warning("Audio queue full - dropped the oldest frame")
+                # Messages for the client, sent (and audio coalesced) by websocket_writer
+                out_queue = asyncio.Queue()
 
                 # Task to process incoming WebSocket messages
                 async def handle_websocket_messages():
-                    nonlocal last_audio_time, turn_start_time, first_token_received, turn_count
-                    
                     async for message in websocket:
                         try:
-                            data = json.loads(message)
-                            if data.get("type") == "audio":
+                            # Binary frames carry tagged raw PCM - no base64 or JSON to decode
+                            if isinstance(message, bytes):
+                                if message[:1] == AUDIO_FRAME_TAG:
+                                    queue_audio(message[1:])
+                                continue
+                            
+                            data = orjson.loads(message)
+                            msg_type = data.get("type")
+                            if msg_type == "audio":
                                 # Update last audio time when we receive audio from user
-                                last_audio_time = time.time()
+                                state.last_audio_ns = _now()
                                 
-                                # Decode base64 audio data
-                                audio_bytes = base64.b64decode(data.get("data", ""))
+                                # Older clients send base64 audio in JSON (pybase64 uses SIMD when the CPU supports it)
+                                audio_bytes = pybase64.b64decode(data.get("data", ""), validate=False)
                                 # Put audio in queue for processing
-                                await audio_queue.put(audio_bytes)
-                            elif data.get("type") == "end":
+                                queue_audio(audio_bytes)
+                            elif msg_type == "end":
                                 # Client is done sending audio for this turn
                                 print(f"📨 RECEIVED END SIGNAL FROM CLIENT")
                                 logger.info("Received end signal from client")
                                 # Mark the start time for TTFT measurement
-                                if not turn_start_time:  # Only set if not already set
-                                    turn_start_time = time.time()
-                                    first_token_received = False
-                                    print(f"🎤 USER FINISHED SPEAKING (END SIGNAL) - TTFT timer started at {turn_start_time:.3f}")
-                            elif data.get("type") == "text":
+                                if not state.start_ns:  # Only set if not already set
+                                    state.start_ns = _now()
+                                    state.first_token = False
+                                    print(f"🎤 USER FINISHED SPEAKING (END SIGNAL) - TTFT timer started at {state.start_ns / 1e9:.3f}")
+                            elif msg_type == "text":
                                 # Handle text messages (not implemented in this simple version)
                                 logger.info(f"Received text: {data.get('data')}")
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             logger.error("Invalid JSON message received")
                         except Exception as e:
                             logger.error(f"Error processing message: {e}")
 
                 # Task to process and send audio to Gemini
                 async def process_and_send_audio():
+                    # Reused staging buffer: frames that queued up while the previous send
+                    # was in flight are copied into it and sent to Gemini as one chunk
+                    arena = memoryview(bytearray(AUDIO_ARENA_BYTES))
+                    pending = None  # Frame that did not fit in the last batch
                     while True:
-                        data = await audio_queue.get()
-
-                        # Send the audio data to Gemini
-                        await session.send(input={
-                            "mime_type": f"audio/pcm;rate={SEND_SAMPLE_RATE}",
-                            "data": data
-                        })
-
-                        audio_queue.task_done()
+                        data = pending if pending is not None else await audio_queue.get()
+                        pending = None
+
+                        if not audio_queue.empty() and len(data) < AUDIO_ARENA_BYTES:
+                            used = len(data)
+                            arena[:used] = data
+                            while not audio_queue.empty():
+                                frame = audio_queue.get_nowait()
+                                end = used + len(frame)
+                                if end > AUDIO_ARENA_BYTES:
+                                    pending = frame
+                                    break
+                                arena[used:end] = frame
+                                used = end
+                            data = bytes(arena[:used])
+
+                        # Send the audio data to Gemini (model_construct skips re-validating known-good fields)
+                        await session.send_realtime_input(
+                            audio=types.Blob.model_construct(data=data, mime_type=AUDIO_MIME)
+                        )
 
                 # Task to receive and play responses
                 async def receive_and_play():
-                    nonlocal session_initialized, turn_start_time, first_token_received, last_audio_time, turn_count
-                    
                     while True:
                         input_transcriptions = []
                         output_transcriptions = []
+                        # Checked once per turn so the per-chunk f-strings are skipped unless debugging
+                        log_fragments = logger.isEnabledFor(logging.DEBUG)
 
                         # Use the same pattern as reference code
                         turn = session.receive()
                         async for response in turn:
-                            # Handle tool calls using reference implementation
-                            await self.handle_tool_calls(response)
-
-                            # Handle session resumption update - log only on initial connection, but save every time
-                            if response.session_resumption_update:
-                                update = response.session_resumption_update
-                                if update.resumable and update.new_handle:
-                                    # Always save the updated handle
-                                    save_previous_session_handle(update.new_handle)
-                                    
-                                    if not session_initialized:
-                                        logger.info(f"Session established with handle: {update.new_handle}")
-                                        # Send session ID to client
-                                        session_id_msg = json.dumps({
-                                            "type": "session_id",
-                                            "data": update.new_handle
-                                        })
-                                        await websocket.send(session_id_msg)
-                                        session_initialized = True
-                                    else:
-                                        # Print session handle updates after initial connection
-                                        logger.info(f"Session handle updated: {update.new_handle}")
-
-                            # Check if connection will be terminated soon
-                            if response.go_away is not None:
-                                logger.info(f"Session will terminate in: {response.go_away.time_left}")
+                            # JSON messages for the client from this response, sent as one frame
+                            events = []
 
                             server_content = response.server_content
-
-                            # Handle interruption
-                            if (hasattr(server_content, "interrupted") and server_content.interrupted):
-                                logger.info("🤐 INTERRUPTION DETECTED")
-                                # Just notify the client - no need to handle audio on server side
-                                await websocket.send(json.dumps({
-                                    "type": "interrupted",
-                                    "data": "Response interrupted by user input"
-                                }))
-
-                            # Handle audio transcriptions (like reference code)
-                            if response.server_content:
-                                # Output transcription (model's speech to text)
-                                if response.server_content.output_transcription:
-                                    transcript = response.server_content.output_transcription.text
-                                    if transcript and transcript.strip():  # Only print non-empty transcripts
-                                        print(f"📝 Received text transcription: '{transcript[:50]}...'")
-                                        logger.info(f"🎤 Model said: {transcript}")
-                                        output_transcriptions.append(transcript)
-                                        
-                                        # Calculate TTFT for text if this is the first response and we haven't received audio yet
-                                        if turn_start_time and not first_token_received:
-                                            ttft = (time.time() - turn_start_time) * 1000  # Convert to milliseconds
-                                            print(f"📝 TURN {turn_count} - TIME TO FIRST TEXT TOKEN: {ttft:.2f}ms")
-                                            logger.info(f"📝 Time to First Text Token: {ttft:.2f}ms")
-                                            first_token_received = True
-                                        
-                                        # Send text to client
-                                        await websocket.send(json.dumps({
-                                            "type": "otext",
-                                            "data": transcript
-                                        }))
-                                
-                                # Input transcription (user's speech to text)
-                                if response.server_content.input_transcription:
-                                    transcript = response.server_content.input_transcription.text
-                                    if transcript and transcript.strip():  # Only print non-empty transcripts
-                                        print(f"👤 User said: {transcript}")
-                                        logger.info(f"🗣️  You said: {transcript}")
-                                        input_transcriptions.append(transcript)
-                                        
-                                        # When we get input transcription, this means user just finished speaking
-                                        # Start TTFT timer if not already started
-                                        if not turn_start_time and not first_token_received:
-                                            turn_start_time = time.time()
-                                            turn_count += 1
-                                            print(f"🎤 TURN {turn_count}: User finished speaking (VAD detected) - TTFT timer started at {turn_start_time:.3f}")
-                                        
-                                        await websocket.send(json.dumps({
-                                            "type": "itext",
-                                            "data": transcript
-                                        }))
-
-                            # Handle audio data (like reference code)
+                            if server_content is None:
+                                # Tool calls, resumption handles and go-away notices never carry content
+                                self.handle_control_message(response, state, events)
+                                if response.tool_call:
+                                    # Handle tool calls using reference implementation
+                                    await self.handle_tool_calls(response)
+                                if events:
+                                    out_queue.put_nowait(events)
+                                continue
+
+                            # Handle audio data first - it is by far the most common message
                             if data := response.data:
                                 # Calculate TTFT if this is the first token
-                                if turn_start_time and not first_token_received:
-                                    ttft = (time.time() - turn_start_time) * 1000  # Convert to milliseconds
-                                    print(f"⚡ TURN {turn_count} - TIME TO FIRST AUDIO TOKEN: {ttft:.2f}ms")
+                                if state.start_ns and not state.first_token:
+                                    ttft = (_now() - state.start_ns) / 1e6  # Convert to milliseconds
+                                    print(f"⚡ TURN {state.count} - TIME TO FIRST AUDIO TOKEN: {ttft:.2f}ms")
                                     logger.info(f"⚡ Time to First Token: {ttft:.2f}ms")
-                                    first_token_received = True
+                                    state.first_token = True
                                 
-                                # Send audio to client only (don't play locally)
-                                b64_audio = base64.b64encode(data).decode('utf-8')
-                                await websocket.send(json.dumps({
-                                    "type": "audio",
-                                    "data": b64_audio
-                                }))
+                                # Queue raw PCM for the client; the writer sends it as tagged binary frames (no base64/JSON)
+                                out_queue.put_nowait(data)
                             elif text := response.text:
                                 # Handle any text responses
                                 logger.info(f"Text response: {text}")
 
+                            # Resolve the remaining content fields once; everything below uses these locals
+                            output_transcription = server_content.output_transcription
+                            input_transcription = server_content.input_transcription
+
+                            # Handle interruption
+                            if server_content.interrupted:
+                                logger.info("🤐 INTERRUPTION DETECTED")
+                                # Just notify the client - no need to handle audio on server side
+                                events.append(INTERRUPTED_EVENT)
+
+                            # Handle audio transcriptions (like reference code)
+                            if output_transcription:
+                                transcript = output_transcription.text
+                                if transcript and transcript.strip():  # Only log non-empty transcripts
+                                    # Fragments are per chunk; the full transcript is logged once per turn below
+                                    if log_fragments:
+                                        logger.debug(f"🎤 Model said: {transcript}")
+                                    output_transcriptions.append(transcript)
+                                    
+                                    # Calculate TTFT for text if this is the first response and we haven't received audio yet
+                                    if state.start_ns and not state.first_token:
+                                        ttft = (_now() - state.start_ns) / 1e6  # Convert to milliseconds
+                                        print(f"📝 TURN {state.count} - TIME TO FIRST TEXT TOKEN: {ttft:.2f}ms")
+                                        logger.info(f"📝 Time to First Text Token: {ttft:.2f}ms")
+                                        state.first_token = True
+                                    
+                                    # Send text to client
+                                    events.append(OTEXT_PREFIX + orjson.dumps(transcript) + b"}")
+                            
+                            # Input transcription (user's speech to text)
+                            if input_transcription:
+                                transcript = input_transcription.text
+                                if transcript and transcript.strip():  # Only log non-empty transcripts
+                                    if log_fragments:
+                                        logger.debug(f"🗣️  You said: {transcript}")
+                                    input_transcriptions.append(transcript)
+                                    
+                                    # When we get input transcription, this means user just finished speaking
+                                    # Start TTFT timer if not already started
+                                    if not state.start_ns and not state.first_token:
+                                        state.start_ns = _now()
+                                        state.count += 1
+                                        print(f"🎤 TURN {state.count}: User finished speaking (VAD detected) - TTFT timer started at {state.start_ns / 1e9:.3f}")
+                                    
+                                    events.append(ITEXT_PREFIX + orjson.dumps(transcript) + b"}")
+
                             # Handle turn completion
-                            if server_content and server_content.turn_complete:
-                                if turn_start_time and first_token_received:
-                                    total_turn_time = (time.time() - turn_start_time) * 1000
-                                    print(f"✅ TURN {turn_count} COMPLETE - Total response time: {total_turn_time:.2f}ms")
+                            if server_content.turn_complete:
+                                if state.start_ns and state.first_token:
+                                    total_turn_time = (_now() - state.start_ns) / 1e6
+                                    print(f"✅ TURN {state.count} COMPLETE - Total response time: {total_turn_time:.2f}ms")
                                 else:
-                                    print(f"✅ TURN {turn_count} COMPLETE - No timing data")
+                                    print(f"✅ TURN {state.count} COMPLETE - No timing data")
                                 
                                 logger.info("✅ Gemini done talking")
                                 # Reset TTFT tracking for next turn
-                                turn_start_time = None
-                                first_token_received = False
-                                await websocket.send(json.dumps({
-                                    "type": "turn_complete"
-                                }))
+                                state.start_ns = None
+                                state.first_token = False
+                                events.append(TURN_COMPLETE_EVENT)
+
+                            if events:
+                                out_queue.put_nowait(events)
 
                         logger.info(f"Input transcription: {''.join(input_transcriptions)}")
                         logger.info(f"Output transcription: {''.join(output_transcriptions)}")
                         
 
                 # Start all tasks
+                tg.create_task(websocket_writer(websocket, out_queue))
                 tg.create_task(handle_websocket_messages())
                 tg.create_task(process_and_send_audio())
                 tg.create_task(receive_and_play())
@@ -447,7 +617,7 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
 async def main():
     """Main function to start the server"""
     # Calculate time to reach main execution
-    main_start_time = (time.time() - PROGRAM_START_TIME) * 1000
+    main_start_time = (_now() - PROGRAM_START_TIME) / 1e6
     print(f"⏰ Reached main() in {main_start_time:.2f}ms")
     
     print("🚀 Starting WebSocket server with tools...")
@@ -458,14 +628,15 @@ async def main():
     print("  - pause_for_10_seconds")
     print("  - google_search")
     
-    server_start_time = time.time()
+    # Create the client before accepting connections so the first one does not pay for it
+    get_client()
     
     server = LiveAPIWebSocketServer()
     await server.start()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        get_runner()(main())
     except KeyboardInterrupt:
         logger.info("Exiting application via KeyboardInterrupt...")
     except Exception as e:
@@ -82,6 +82,12 @@ Every single tool you generate must adhere to the parameter rules above to ensur
 """
     return prompt
 
+def schema_number(param_type: str, value: Any) -> Any:
+    """Keeps bounds of integer parameters as integers (the response schema returns them as floats)."""
+    if param_type == "integer" and isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
 def validate_tool_definitions(tools: List[ToolDefinition]) -> List[Dict[str, Any]]:
     """Validates and converts tool definitions to the expected format."""
     validated_tools = []
@@ -110,11 +116,11 @@ def validate_tool_definitions(tools: List[ToolDefinition]) -> List[Dict[str, Any
                 if param_def.enum:
                     param_dict["enum"] = param_def.enum
                 if param_def.minimum is not None:
-                    param_dict["minimum"] = param_def.minimum
+                    param_dict["minimum"] = schema_number(param_def.type, param_def.minimum)
                 if param_def.maximum is not None:
-                    param_dict["maximum"] = param_def.maximum
+                    param_dict["maximum"] = schema_number(param_def.type, param_def.maximum)
                 if param_def.default is not None:
-                    param_dict["default"] = param_def.default
+                    param_dict["default"] = schema_number(param_def.type, param_def.default)
                     
                 tool_dict["parameters"]["properties"][param_name] = param_dict
             
@@ -167,11 +173,9 @@ def main(num_tools: int):
         
         # 5. Save to file
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        output_path = os.path.join(script_dir, "tools.py")
+        output_path = os.path.join(script_dir, "tools.json")  # Loaded by tools.py
         
         with open(output_path, 'w') as f:
-            f.write("# tools.py - Defines the functions available to the LiveAPI\n\n")
-            f.write("TOOLS_DEFINITION = ")
             json.dump(validated_tools, f, indent=2)
             f.write("\n")
             
@@ -7,15 +7,11 @@ from typing import List, Dict, Any
 
 import websockets
 import base64
-import importlib
 
 import config
 import tts_client
 from google import genai
 
-# Force reload of the config module to pick up changes
-importlib.reload(config)
-
 def load_test_cases_from_json(file_path: str) -> List[Dict[str, Any]]:
     """Loads test cases from a JSON file."""
     try:
@@ -44,9 +40,11 @@ async def run_test_cases(test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any
         print(f"\n--- Running Test Case {i+1}/{len(test_cases)} ---")
         print(f"Spoken Text: {test_case['spoken_text']}")
 
-        audio_content = tts_client.convert_text_to_audio(test_case["spoken_text"])
-
-        if not audio_content:
+        # Keep the padded audio as its parts (kept for retries) instead of one concatenated buffer
+        try:
+            audio_parts = [part async for part in tts_client.iter_text_to_audio(test_case["spoken_text"])]
+        except Exception as e:
+            print(f"❌ TTS Client Error: {e}")
             print("Skipping test case due to TTS failure.")
             continue
 
@@ -63,20 +61,22 @@ async def run_test_cases(test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any
 
                     # Stream the audio in chunks to simulate a real-time feed
                     chunk_size = 1024
-                    total_chunks = (len(audio_content) + chunk_size - 1) // chunk_size
+                    total_bytes = sum(len(part) for part in audio_parts)
+                    total_chunks = sum((len(part) + chunk_size - 1) // chunk_size for part in audio_parts)
                     
-                    print(f"Streaming {len(audio_content)} bytes in {total_chunks} chunks...")
-
-                    for i in range(0, len(audio_content), chunk_size):
-                        chunk = audio_content[i:i+chunk_size]
-                        audio_b64 = base64.b64encode(chunk).decode('utf-8')
-                        
-                        await websocket.send(json.dumps({
-                            "type": "audio",
-                            "data": audio_b64
-                        }))
-                        
-                        await asyncio.sleep(0.02)
+                    print(f"Streaming {total_bytes} bytes in {total_chunks} chunks...")
+
+                    for part in audio_parts:
+                        for i in range(0, len(part), chunk_size):
+                            chunk = part[i:i+chunk_size]
+                            audio_b64 = base64.b64encode(chunk).decode('utf-8')
+                            
+                            await websocket.send(json.dumps({
+                                "type": "audio",
+                                "data": audio_b64
+                            }))
+                            
+                            await asyncio.sleep(0.02)
 
                     print("Finished streaming audio.")
                     await websocket.send(json.dumps({"type": "end"}))
@@ -85,8 +85,12 @@ async def run_test_cases(test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any
                     while True:
                         try:
                             message = await asyncio.wait_for(websocket.recv(), timeout=10.0) # Increased timeout
+                            if isinstance(message, bytes):
+                                continue  # Binary frames carry model audio, not needed here
                             data = json.loads(message)
-                            if data.get("type") == "turn_complete" or data.get("type") == "ready":
+                            # The server may coalesce several messages into one "batch" frame
+                            items = data.get("items", []) if data.get("type") == "batch" else [data]
+                            if any(item.get("type") in ("turn_complete", "ready") for item in items):
                                 print("✅ Received turn_complete signal from server.")
                                 break
                         except asyncio.TimeoutError:
@@ -1,9 +1,11 @@
 import asyncio
 import json
 import base64
+import mmap
+import orjson
 import os
+import struct
 import time
-import wave
 from datetime import datetime
 from google import genai
 from google.genai import types
@@ -36,6 +38,59 @@ CONFIG = {
     },
 }
 
+# Validate the config (including TOOLS_DEFINITION) once instead of on every connect
+LIVE_CONFIG = types.LiveConnectConfig(**CONFIG)
+
+# Coalesce model audio into frames of at least 80ms at 24kHz before base64-encoding it for the client
+MIN_AUDIO_SEND = 3840
+
+# Seconds of audio to preallocate per recording; the mapping doubles if a session runs longer
+WAV_PREALLOC_SECONDS = 60
+WAV_HEADER_SIZE = 44
+
+class MmapWaveWriter:
+    """Mono 16-bit PCM WAV writer that copies frames straight into a preallocated mmap"""
+    def __init__(self, path, framerate, prealloc_seconds=WAV_PREALLOC_SECONDS):
+        self.framerate = framerate
+        self._file = open(path, "w+b")
+        self._capacity = WAV_HEADER_SIZE + framerate * 2 * prealloc_seconds
+        self._file.truncate(self._capacity)
+        self._mm = mmap.mmap(self._file.fileno(), self._capacity)
+        self._write_pos = WAV_HEADER_SIZE
+        # Placeholder header (no data yet) so a killed session still leaves a WAV file; close() patches the sizes
+        self._write_header(0)
+
+    def _write_header(self, data_size):
+        self._mm[:WAV_HEADER_SIZE] = struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + data_size, b"WAVE",
+            b"fmt ", 16, 1, 1, self.framerate, self.framerate * 2, 2, 16,
+            b"data", data_size,
+        )
+
+    def writeframes(self, data):
+        end = self._write_pos + len(data)
+        if end > self._capacity:
+            self._grow(end)
+        self._mm[self._write_pos:end] = data
+        self._write_pos = end
+
+    def _grow(self, min_capacity):
+        self._mm.close()
+        self._capacity = max(min_capacity, self._capacity * 2)
+        self._file.truncate(self._capacity)
+        self._mm = mmap.mmap(self._file.fileno(), self._capacity)
+
+    def close(self):
+        """Patch the WAV header sizes and trim the file to the recorded length"""
+        if self._mm is None:
+            return
+        self._write_header(self._write_pos - WAV_HEADER_SIZE)
+        self._mm.close()
+        self._mm = None
+        self._file.truncate(self._write_pos)
+        self._file.close()
+
 class SessionData:
     """Container for session data to be logged at the end"""
     def __init__(self, test_id):
@@ -54,16 +109,17 @@ class SessionData:
             # Log each tool call or NO_TOOL_CALLED marker
             calls_to_log = self.tool_calls if self.tool_calls else [{"tool_name": "NO_TOOL_CALLED", "arguments": None, "execution_time_ms": 0}]
             
+            # Serialize the shared session fields once and splice each call onto that prefix
+            prefix = orjson.dumps({
+                "test_id": self.test_id,
+                "timestamp_utc": self.timestamp_utc,
+                "model_response_transcription": self.model_transcription.strip(),
+                "user_input_transcription": self.user_transcription.strip(),
+            })[:-1] + b","
+            payload = b"".join(prefix + orjson.dumps(call)[1:] + b"\n" for call in calls_to_log)
+            with open(config.SERVER_LOG_FILE, "ab") as f:
+                f.write(payload)
             for call in calls_to_log:
-                log_entry = {
-                    "test_id": self.test_id,
-                    "timestamp_utc": self.timestamp_utc,
-                    "model_response_transcription": self.model_transcription.strip(),
-                    "user_input_transcription": self.user_transcription.strip(),
-                    **call
-                }
-                with open(config.SERVER_LOG_FILE, "a") as f:
-                    f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
                 print(f"📝 FINAL LOG: {call['tool_name']}")
         except Exception as e:
             print(f"❌ CRITICAL: Failed to log session data: {e}")
@@ -123,17 +179,11 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
             
             # Input audio recording
             input_file = os.path.join(config.RESULTS_DIR, f"received_audio_{timestamp}.wav")
-            wave_files["input"] = wave.open(input_file, 'wb')
-            wave_files["input"].setnchannels(1)
-            wave_files["input"].setsampwidth(2)
-            wave_files["input"].setframerate(SEND_SAMPLE_RATE)
+            wave_files["input"] = MmapWaveWriter(input_file, SEND_SAMPLE_RATE)
             
             # Output audio recording
             output_file = os.path.join(config.RESULTS_DIR, f"model_output_audio_{timestamp}.wav")
-            wave_files["output"] = wave.open(output_file, 'wb')
-            wave_files["output"].setnchannels(1)
-            wave_files["output"].setsampwidth(2)
-            wave_files["output"].setframerate(24000)
+            wave_files["output"] = MmapWaveWriter(output_file, RECEIVE_SAMPLE_RATE)
             
             print(f"🎤 Recording audio to: {input_file} & {output_file}")
         except Exception as e:
@@ -156,7 +206,7 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
 
         try:
             #print ("MODEL :", MODEL )
-            async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
+            async with client.aio.live.connect(model=MODEL, config=LIVE_CONFIG) as session:
                 self.session = session
                 
                 async with asyncio.TaskGroup() as tg:
@@ -208,6 +258,13 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
 
                     async def handle_responses():
                         nonlocal turn_start_time, first_token_received, turn_count, session_data
+                        pending_audio = bytearray()
+
+                        async def flush_audio():
+                            if pending_audio:
+                                b64_audio = base64.b64encode(pending_audio).decode('utf-8')
+                                pending_audio.clear()
+                                await self.safe_send(websocket, {"type": "audio", "data": b64_audio})
                         
                         while True:
                             turn = session.receive()
@@ -223,6 +280,7 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                                     
                                     # Handle interruption
                                     if hasattr(sc, "interrupted") and sc.interrupted:
+                                        pending_audio.clear()
                                         await self.safe_send(websocket, {"type": "interrupted", "data": "Response interrupted"})
                                     
                                     # Handle transcriptions
@@ -259,6 +317,7 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                                             total_time = (time.time() - turn_start_time) * 1000
                                             print(f"✅ TURN {turn_count} COMPLETE: {total_time:.2f}ms")
                                         
+                                        await flush_audio()
                                         await self.safe_send(websocket, {"type": "turn_complete"})
                                         
                                         # CRITICAL: Final logging before disconnection
@@ -280,9 +339,10 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                                     if wave_files["output"]:
                                         wave_files["output"].writeframes(response.data)
                                     
-                                    # Send to client
-                                    b64_audio = base64.b64encode(response.data).decode('utf-8')
-                                    await self.safe_send(websocket, {"type": "audio", "data": b64_audio})
+                                    # Send to client once enough audio has accumulated
+                                    pending_audio += response.data
+                                    if len(pending_audio) >= MIN_AUDIO_SEND:
+                                        await flush_audio()
 
                     # Start both tasks
                     tg.create_task(handle_messages())
@@ -309,7 +369,9 @@ async def main(model: str, save_audio: bool = True):
     server = LiveAPIWebSocketServer(save_audio_files=save_audio)
     global MODEL
     MODEL = model
-    await server.start()
+    # Log records are written by a listener thread while the server runs
+    with queued_logging():
+        await server.start()
 
 if __name__ == "__main__":
     import argparse
@@ -3,7 +3,10 @@ import os
 import asyncio
 import json
 import base64
+import contextlib
 import logging
+import logging.handlers
+import queue
 import websockets
 import traceback
 from websockets.exceptions import ConnectionClosed
@@ -12,6 +15,27 @@ from websockets.exceptions import ConnectionClosed
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@contextlib.contextmanager
+def queued_logging():
+    """
+    Route log records through a queue to a listener thread for the duration of the block.
+
+    Log calls then only enqueue the record, so a burst of log lines (e.g. many clients
+    disconnecting) never blocks the event loop. Enter it in the process that serves
+    (after any fork): the listener thread does not survive a fork. Leaving the block
+    writes what is still queued and restores the direct handlers.
+    """
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers
+    listener = logging.handlers.QueueListener(queue.SimpleQueue(), *handlers, respect_handler_level=True)
+    root_logger.handlers = [logging.handlers.QueueHandler(listener.queue)]
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        root_logger.handlers = handlers
+
 # --- GCP Project & Model Details ---
 PROJECT_ID = "cloud-llm-preview1"
 LOCATION = "us-central1"
@@ -50,16 +74,80 @@ SERVER_LOG_FILE = os.path.join(BASE_DIR, "tool_call_log.jsonl")
 # --- Live API Endpoint to Test ---
 LIVE_API_ENDPOINT = "ws://localhost:8765"
 
+# --- WebSocket Framing ---
+# Binary frames carry raw 16-bit PCM prefixed with this tag byte; text frames carry JSON control messages
+AUDIO_FRAME_TAG = b"\x01"
+
+# --- WebSocket Server Limits ---
+WS_MAX_QUEUE = 32       # Incoming frames buffered per connection before reads are paused
+WS_PING_INTERVAL = 20   # Seconds between keepalive pings
+WS_PING_TIMEOUT = 20    # Seconds to wait for a pong before dropping the connection
+
+# --- Server Log Writer ---
+# Serialized JSONL entries waiting to be appended to SERVER_LOG_FILE by log_writer()
+LOG_QUEUE = asyncio.Queue()
+
+def append_to_log(payload):
+    """Append serialized log entries to the server log with a single write"""
+    with open(SERVER_LOG_FILE, "ab", buffering=0) as f:
+        f.write(payload)
+
+async def log_writer(queue=LOG_QUEUE):
+    """
+    Background task that drains queued log entries and writes them off the event loop.
+
+    Everything queued since the last write is joined and appended in one batch. The file
+    is reopened per batch so a client that deletes the log between runs starts a fresh file.
+    """
+    while True:
+        entries = [await queue.get()]
+        while not queue.empty():
+            entries.append(queue.get_nowait())
+        try:
+            await asyncio.to_thread(append_to_log, b"".join(entries))
+        except Exception as e:
+            print(f"❌ Failed to write server log: {e}")
+
+def flush_log_queue(queue=LOG_QUEUE):
+    """Write whatever is still queued (called on shutdown, after log_writer has stopped)"""
+    entries = []
+    while not queue.empty():
+        entries.append(queue.get_nowait())
+    if entries:
+        try:
+            append_to_log(b"".join(entries))
+        except Exception as e:
+            print(f"❌ Failed to write server log: {e}")
+
+# --- Event Loop ---
+def get_runner():
+    """Prefer uvloop's libuv-based event loop when it is available (not supported on Windows)"""
+    try:
+        import uvloop
+        return uvloop.run
+    except ImportError:
+        return asyncio.run
+
 # --- Base WebSocket Server Class ---
 class BaseWebSocketServer:
-    def __init__(self, host="0.0.0.0", port=8765):
+    def __init__(self, host="0.0.0.0", port=8765, reuse_port=False):
         self.host = host
         self.port = port
+        self.reuse_port = reuse_port  # SO_REUSEPORT: let several worker processes share the port
         self.active_clients = {}
 
     async def start(self):
         logger.info(f"Starting WebSocket server on {self.host}:{self.port}")
-        async with websockets.serve(self.handle_client, self.host, self.port):
+        async with websockets.serve(
+            self.handle_client, self.host, self.port,
+            reuse_port=self.reuse_port,
+            max_queue=WS_MAX_QUEUE,
+            ping_interval=WS_PING_INTERVAL,
+            ping_timeout=WS_PING_TIMEOUT,
+            # Audio dominates the traffic and PCM barely compresses; websockets can only switch
+            # permessage-deflate per connection, not per frame, so it is turned off
+            compression=None,
+        ):
             await asyncio.Future()
 
     async def handle_client(self, websocket):
@@ -21,24 +21,34 @@ Flow:
 """
 
 import asyncio
-import json
 import base64
+import functools
+import multiprocessing
+import orjson
 import os
 import time
+import uuid
 import wave
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from google import genai
 from google.genai import types
+from websockets.exceptions import ConnectionClosed
 from config import *
 from tools import TOOLS_DEFINITION
 import config
 
 # Record program start time for performance tracking
-PROGRAM_START_TIME = time.time()
-print(f"🚀 PROGRAM STARTED at {PROGRAM_START_TIME:.3f}")
+# (monotonic clock in ns; wall-clock time is only printed)
+PROGRAM_START_TIME = time.monotonic_ns()
+print(f"🚀 PROGRAM STARTED at {time.time():.3f}")
 
-# Initialize Google Gemini client with Vertex AI authentication
-client = genai.Client(vertexai=True, project=PROJECT_ID, location=LOCATION)
+# Google Gemini client with Vertex AI authentication, created on first use in each process:
+# --workers forks the server, and a client (with its HTTP transport) made before the fork
+# would be shared by every worker
+@functools.lru_cache(maxsize=1)
+def get_client():
+    return genai.Client(vertexai=True, project=PROJECT_ID, location=LOCATION)
 
 # Gemini Live API Configuration
 CONFIG = {
@@ -61,6 +71,23 @@ CONFIG = {
     },
 }
 
+# Validate the config (including TOOLS_DEFINITION) into the SDK's typed objects once instead of on every connect
+LIVE_CONFIG = types.LiveConnectConfig(**CONFIG)
+
+# Client audio is forwarded to Gemini in batches: once this many bytes are buffered
+# (60ms of 16kHz 16-bit mono) or when the flush interval elapses, whichever comes first
+AUDIO_FLUSH_BYTES = 1920
+AUDIO_FLUSH_INTERVAL = 0.06  # seconds
+AUDIO_MIME_TYPE = f"audio/pcm;rate={SEND_SAMPLE_RATE}"  # Fixed format of forwarded client audio
+AUDIO_ARENA_BYTES = SEND_SAMPLE_RATE * 2  # Preallocated staging buffer (1s), reused for every batch
+
+def write_wave_frames(wave_file, audio_bytes):
+    """Append PCM to a WAV file (runs on the WAV executor, whose futures are not awaited, so errors are reported here)"""
+    try:
+        wave_file.writeframes(audio_bytes)
+    except Exception as e:
+        print(f"❌ Error writing to wave file: {e}")
+
 class SessionData:
     """
     Container for all session data that will be logged at the end.
@@ -76,8 +103,8 @@ class SessionData:
         self.test_id = test_id                    # Unique identifier for this test session
         self.timestamp_utc = time.time()          # Session start timestamp
         self.tool_calls = []                      # List of all tool calls made
-        self.model_transcription = ""             # AI's complete speech transcription
-        self.user_transcription = ""              # User's complete speech transcription
+        self.model_transcription_parts = []       # AI speech transcription fragments
+        self.user_transcription_parts = []        # User speech transcription fragments
         
     def add_tool_call(self, name, args, exec_time):
         """Store a tool call for later logging"""
@@ -100,19 +127,24 @@ class SessionData:
                 {"tool_name": "NO_TOOL_CALLED", "arguments": None, "execution_time_ms": 0}
             ]
             
-            # Write each tool call (or marker) as a separate JSONL entry
-            for call in calls_to_log:
-                log_entry = {
+            # Serialize each tool call (or marker) as a separate JSONL entry
+            # orjson emits UTF-8 bytes directly, so Unicode transcriptions are kept as-is
+            model_transcription = " ".join(self.model_transcription_parts).strip()
+            user_transcription = " ".join(self.user_transcription_parts).strip()
+            payload = b"".join(
+                orjson.dumps({
                     "test_id": self.test_id,
                     "timestamp_utc": self.timestamp_utc,
-                    "model_response_transcription": self.model_transcription.strip(),
-                    "user_input_transcription": self.user_transcription.strip(),
+                    "model_response_transcription": model_transcription,
+                    "user_input_transcription": user_transcription,
                     **call  # Spread the tool call data
-                }
-                
-                # Write to JSONL file with Unicode support
-                with open(config.SERVER_LOG_FILE, "a") as f:
-                    f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+                }) + b"\n"
+                for call in calls_to_log
+            )
+            
+            # Hand the entries to the background writer so no disk I/O happens before disconnect
+            LOG_QUEUE.put_nowait(payload)
+            for call in calls_to_log:
                 print(f"📝 FINAL LOG: {call['tool_name']}")
                 
         except Exception as e:
@@ -131,34 +163,59 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
     
     Each session is limited to one conversation turn for evaluation purposes.
     """
-    def __init__(self, host="0.0.0.0", port=8765, save_audio_files=True):
-        super().__init__(host, port)
-        self.session = None                       # Gemini Live API session
+    def __init__(self, host="0.0.0.0", port=8765, save_audio_files=True, reuse_port=False):
+        super().__init__(host, port, reuse_port=reuse_port)
         self.save_audio_files = save_audio_files  # Whether to record audio files
 
-    async def safe_send(self, websocket, message):
+    async def send_json(self, websocket, payload):
+        """
+        Send a control message to the client as a JSON text frame.
+        
+        Args:
+            websocket: The WebSocket connection
+            payload: Dict to serialize (UTF-8, non-ASCII kept as-is)
+            
+        Returns:
+            bool: True if sent successfully, False otherwise (including once the client is gone)
+        """
+        client_id = id(websocket)
+        if client_id not in self.active_clients:
+            return False  # Already known to be disconnected - skip without raising
+        try:
+            await websocket.send(orjson.dumps(payload).decode())
+            return True
+        except ConnectionClosed:
+            # Client dropped: unregister it so the rest of the turn's sends are no-ops
+            self.active_clients.pop(client_id, None)
+        except Exception as e:
+            print(f"⚠️ WebSocket send error: {e}")
+        return False
+
+    async def send_bytes(self, websocket, data):
         """
-        Safely send a message via WebSocket with error handling.
+        Send a binary frame (tagged audio) to the client.
         
         Args:
             websocket: The WebSocket connection
-            message: Dict or string message to send
+            data: Bytes to send as-is
             
         Returns:
-            bool: True if sent successfully, False otherwise
+            bool: True if sent successfully, False otherwise (including once the client is gone)
         """
+        client_id = id(websocket)
+        if client_id not in self.active_clients:
+            return False  # Already known to be disconnected - skip without raising
         try:
-            if hasattr(websocket, 'open') and websocket.open:
-                # Convert dict to JSON string if needed, with Unicode support
-                if isinstance(message, dict):
-                    message = json.dumps(message, ensure_ascii=False)
-                await websocket.send(message)
-                return True
+            await websocket.send(data)
+            return True
+        except ConnectionClosed:
+            # Client dropped: unregister it so the rest of the turn's sends are no-ops
+            self.active_clients.pop(client_id, None)
         except Exception as e:
             print(f"⚠️ WebSocket send error: {e}")
         return False
 
-    async def handle_tool_calls(self, response, session_data):
+    async def handle_tool_calls(self, session, response, session_data):
         """
         Process tool/function calls from Gemini and store execution data.
         
@@ -169,6 +226,7 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
         4. Returns the result to Gemini
         
         Args:
+            session: This connection's Gemini Live API session (receives the function responses)
             response: Gemini response containing tool calls
             session_data: SessionData object to store call information
         """
@@ -179,14 +237,14 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
         
         # Process each function call in the response
         for fc in response.tool_call.function_calls:
-            start_time = time.time()
-            print(f"🛠️ Executing tool: {fc.name}")
+            start_time = time.monotonic_ns()
+            logger.debug("🛠️ Executing tool: %s", fc.name)
             
             # Store tool call data in session (actual execution happens elsewhere)
             session_data.add_tool_call(
                 fc.name, 
                 fc.args if hasattr(fc, 'args') and fc.args else None,
-                round((time.time() - start_time) * 1000, 2)  # Execution time in ms
+                round((time.monotonic_ns() - start_time) / 1e6, 2)  # Execution time in ms
             )
             
             # Create response for Gemini
@@ -198,8 +256,8 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
 
         # Send all function responses back to Gemini
         try:
-            await self.session.send_tool_response(function_responses=function_responses)
-            print(f"📤 Sent {len(function_responses)} function responses")
+            await session.send_tool_response(function_responses=function_responses)
+            logger.debug("📤 Sent %d function responses", len(function_responses))
         except Exception as e:
             print(f"❌ Failed to send function responses: {e}")
 
@@ -207,7 +265,7 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
         """
         Set up WAV file recording for both input (user) and output (AI) audio.
         
-        Creates timestamped WAV files in the results directory for:
+        Creates timestamped WAV files (unique per connection) in the results directory for:
         - User audio input (16kHz, 16-bit)  
         - AI audio output (24kHz, 16-bit)
         
@@ -221,7 +279,8 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
         try:
             # Ensure results directory exists
             os.makedirs(config.RESULTS_DIR, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # The uuid suffix keeps connections opened in the same second (or by other workers) apart
+            timestamp = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
             
             # Setup input audio recording (user speech)
             input_file = os.path.join(config.RESULTS_DIR, f"received_audio_{timestamp}.wav")
@@ -257,24 +316,26 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
         The session is limited to one conversation turn for evaluation purposes.
         """
         # Calculate and log startup performance
-        startup_time = (time.time() - PROGRAM_START_TIME) * 1000
+        startup_time = (time.monotonic_ns() - PROGRAM_START_TIME) / 1e6
         print(f"🔌 WEBSOCKET READY! Startup time: {startup_time:.2f}ms")
         
         # Initialize session variables
         session_data = None                # Will store all conversation data
-        turn_start_time = None            # Time when user finished speaking
+        turn_start_time = None            # time.monotonic_ns() when user finished speaking
         first_token_received = False      # Whether we've received first AI response
         turn_count = 0                    # Number of conversation turns
-        audio_buffer = bytearray()        # Buffer for collecting audio chunks
+        audio_arena = bytearray(AUDIO_ARENA_BYTES)  # Client audio not yet forwarded to Gemini...
+        audio_cursor = 0                            # ...occupies audio_arena[:audio_cursor]
         wave_files = self.setup_audio_recording()  # Setup audio file recording
+        wave_executor = ThreadPoolExecutor(max_workers=1)  # Runs WAV writes in order, off the event loop
+        loop = asyncio.get_running_loop()
         
         # Register this client
         self.active_clients[client_id] = websocket
 
         try:
             # Connect to Gemini Live API
-            async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
-                self.session = session  # Store session reference for tool calls
+            async with get_client().aio.live.connect(model=MODEL, config=LIVE_CONFIG) as session:
                 
                 # Run two concurrent tasks for bidirectional communication
                 async with asyncio.TaskGroup() as tg:
@@ -284,16 +345,72 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                         Task 1: Process incoming WebSocket messages from client.
                         
                         Handles:
+                        - binary frames: Tagged raw PCM audio, forwarded like "audio"
                         - start_test: Initialize session with test ID
-                        - audio: Forward audio data to Gemini
+                        - audio: Forward audio data to Gemini (coalesced, see flush_audio)
                         - end: Signal end of user speech, start TTFT timer
                         - ping: Keep connection alive
                         """
-                        nonlocal session_data, turn_start_time, first_token_received, audio_buffer
+                        nonlocal session_data, turn_start_time, first_token_received, audio_cursor
+                        flush_timer = None  # Pending call_later handle for a timed flush
+                        
+                        # Bind per-chunk lookups to locals once for the lifetime of the connection
+                        send_realtime_input = session.send_realtime_input
+                        send_json = self.send_json
+                        run_in_executor = loop.run_in_executor
+                        write_input = functools.partial(write_wave_frames, wave_files["input"]) if wave_files["input"] else None
+                        
+                        async def flush_audio():
+                            """Forward all buffered client audio to Gemini as a single realtime input"""
+                            nonlocal flush_timer, audio_cursor
+                            if flush_timer:
+                                flush_timer.cancel()
+                                flush_timer = None
+                            if not audio_cursor:
+                                return
+                            chunk = bytes(memoryview(audio_arena)[:audio_cursor])  # Single copy out of the arena
+                            audio_cursor = 0
+                            try:
+                                await send_realtime_input(
+                                    audio=types.Blob(data=chunk, mime_type=AUDIO_MIME_TYPE)
+                                )
+                            except Exception as e:
+                                print(f"⚠️ Failed to forward audio: {e}")
+                        
+                        async def buffer_audio(audio_bytes):
+                            """Record a chunk of client audio and queue it for Gemini"""
+                            nonlocal flush_timer, audio_cursor
+                            end = audio_cursor + len(audio_bytes)
+                            if end > len(audio_arena):
+                                # Make room: forward what is staged, and grow the arena for oversized chunks
+                                await flush_audio()
+                                end = len(audio_bytes)
+                                if end > len(audio_arena):
+                                    audio_arena.extend(bytes(end - len(audio_arena)))
+                            audio_arena[audio_cursor:end] = audio_bytes
+                            audio_cursor = end
+                            
+                            # Record incoming audio for analysis (not awaited)
+                            if write_input:
+                                run_in_executor(wave_executor, write_input, audio_bytes)
+                            
+                            # Forward once a full batch is buffered, otherwise make sure a timed flush is pending
+                            if audio_cursor >= AUDIO_FLUSH_BYTES:
+                                await flush_audio()
+                            elif flush_timer is None:
+                                flush_timer = loop.call_later(
+                                    AUDIO_FLUSH_INTERVAL, lambda: tg.create_task(flush_audio())
+                                )
                         
                         async for message in websocket:
                             try:
-                                data = json.loads(message)
+                                # Binary frames carry tagged raw PCM - no base64 or JSON to decode
+                                if isinstance(message, bytes):
+                                    if message[:1] == AUDIO_FRAME_TAG:
+                                        await buffer_audio(message[1:])
+                                    continue
+                                
+                                data = orjson.loads(message)
                                 msg_type = data.get("type")
                                 
                                 if msg_type == "start_test":
@@ -302,48 +419,31 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                                     print(f"🆔 Test started: {session_data.test_id}")
                                     
                                 elif msg_type == "audio":
-                                    # Receive audio data from client and forward to Gemini
-                                    audio_bytes = base64.b64decode(data.get("data", ""))
-                                    audio_buffer.extend(audio_bytes)  # Buffer for end signal
-                                    
-                                    # Record incoming audio for analysis
-                                    if wave_files["input"]:
-                                        wave_files["input"].writeframes(audio_bytes)
-                                    
-                                    # Forward audio to Gemini Live API
-                                    await session.send_realtime_input(
-                                        audio=types.Blob(
-                                            data=audio_bytes, 
-                                            mime_type=f"audio/pcm;rate={SEND_SAMPLE_RATE}"
-                                        )
-                                    )
+                                    # JSON audio frame (base64 payload) from clients that don't send binary
+                                    await buffer_audio(base64.b64decode(data.get("data", "")))
                                     
                                 elif msg_type == "end":
                                     # Client signals end of speech - start TTFT measurement
-                                    print("📨 End signal received")
+                                    logger.debug("📨 End signal received")
                                     
                                     # Send any remaining buffered audio to Gemini
-                                    if audio_buffer:
-                                        await session.send_realtime_input(
-                                            audio=types.Blob(
-                                                data=bytes(audio_buffer), 
-                                                mime_type=f"audio/pcm;rate={SEND_SAMPLE_RATE}"
-                                            )
-                                        )
-                                        audio_buffer.clear()
+                                    await flush_audio()
                                     
                                     # Start Time-To-First-Token measurement
                                     if not turn_start_time:
-                                        turn_start_time = time.time()
+                                        turn_start_time = time.monotonic_ns()
                                         first_token_received = False
-                                        print(f"🎤 TTFT timer started")
+                                        logger.debug("🎤 TTFT timer started")
                                         
                                 elif msg_type == "ping":
                                     # Respond to keepalive ping
-                                    await self.safe_send(websocket, {"type": "pong"})
+                                    await send_json(websocket, {"type": "pong"})
                                     
                             except Exception as e:
                                 print(f"⚠️ Message processing error: {e}")
+                        
+                        # Client disconnected - forward whatever audio is still buffered
+                        await flush_audio()
 
                     async def handle_responses():
                         """
@@ -357,6 +457,101 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                         """
                         nonlocal turn_start_time, first_token_received, turn_count, session_data
                         
+                        # Bind per-response lookups to locals once for the lifetime of the connection
+                        send_json = self.send_json
+                        send_bytes = self.send_bytes
+                        handle_tool_calls = self.handle_tool_calls
+                        run_in_executor = loop.run_in_executor
+                        write_output = functools.partial(write_wave_frames, wave_files["output"]) if wave_files["output"] else None
+                        
+                        async def on_interrupted(_):
+                            """User started speaking while AI was talking"""
+                            await send_json(websocket, {
+                                "type": "interrupted", 
+                                "data": "Response interrupted"
+                            })
+                        
+                        async def on_output_transcription(transcription):
+                            """AI speech transcription (speech-to-text of AI response)"""
+                            nonlocal first_token_received
+                            text = transcription.text.strip() if transcription.text else ""
+                            if not text:
+                                return
+                            # Store transcription in session data
+                            if session_data:
+                                session_data.model_transcription_parts.append(text)
+                            
+                            # Calculate Time-To-First-Token for text
+                            if turn_start_time and not first_token_received:
+                                ttft = (time.monotonic_ns() - turn_start_time) / 1e6
+                                logger.info("📝 TTFT: %.2fms", ttft)
+                                first_token_received = True
+                            
+                            # Send transcription to client
+                            await send_json(websocket, {"type": "otext", "data": text})
+                        
+                        async def on_input_transcription(transcription):
+                            """User speech transcription (speech-to-text of user input)"""
+                            nonlocal turn_start_time, turn_count
+                            text = transcription.text.strip() if transcription.text else ""
+                            if not text:
+                                return
+                            # Store transcription in session data
+                            if session_data:
+                                session_data.user_transcription_parts.append(text)
+                            
+                            # Start TTFT timer when VAD detects end of user speech
+                            if not turn_start_time:
+                                turn_start_time = time.monotonic_ns()
+                                turn_count += 1
+                                logger.info("🎤 TURN %d: VAD detected", turn_count)
+                            
+                            # Send transcription to client
+                            await send_json(websocket, {"type": "itext", "data": text})
+                        
+                        async def on_turn_complete(_):
+                            """Turn completion - log everything and end the session"""
+                            # Calculate total response time
+                            if turn_start_time and first_token_received:
+                                total_time = (time.monotonic_ns() - turn_start_time) / 1e6
+                                logger.info("✅ TURN %d COMPLETE: %.2fms", turn_count, total_time)
+                            
+                            # Notify client that turn is complete
+                            await send_json(websocket, {"type": "turn_complete"})
+                            
+                            # CRITICAL: Perform final logging before disconnection
+                            print("📝 Performing final logging...")
+                            if session_data:
+                                session_data.finalize_and_log()
+                            
+                            print("✅ Session complete, disconnecting")
+                            return True  # Ends the session
+                        
+                        async def on_audio(audio_data):
+                            """Audio data from Gemini (AI speech)"""
+                            nonlocal first_token_received
+                            # Calculate Time-To-First-Token for audio
+                            if turn_start_time and not first_token_received:
+                                ttft = (time.monotonic_ns() - turn_start_time) / 1e6
+                                logger.info("⚡ AUDIO TTFT: %.2fms", ttft)
+                                first_token_received = True
+                            
+                            # Record AI audio output for analysis (not awaited)
+                            if write_output:
+                                run_in_executor(wave_executor, write_output, audio_data)
+                            
+                            # Send raw PCM to client as a tagged binary frame (no base64/JSON)
+                            await send_bytes(websocket, AUDIO_FRAME_TAG + audio_data)
+                        
+                        # server_content fields checked for every response, in this order;
+                        # a handler returning True ends the session before any audio is forwarded
+                        content_handlers = (
+                            ("interrupted", on_interrupted),
+                            ("output_transcription", on_output_transcription),
+                            ("input_transcription", on_input_transcription),
+                            ("turn_complete", on_turn_complete),
+                        )
+                        
                         while True:
                             # Get the next turn from Gemini
                             turn = session.receive()
@@ -366,92 +561,23 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                                 
                                 # Handle tool/function calls from Gemini
                                 if response.tool_call and session_data:
-                                    await self.handle_tool_calls(response, session_data)
-
+                                    await handle_tool_calls(session, response, session_data)
+                                
                                 # Process server content (transcriptions, audio, etc.)
-                                if response.server_content:
-                                    sc = response.server_content  # Shorthand for readability
-                                    
-                                    # Handle interruption (user started speaking while AI was talking)
-                                    if hasattr(sc, "interrupted") and sc.interrupted:
-                                        await self.safe_send(websocket, {
-                                            "type": "interrupted", 
-                                            "data": "Response interrupted"
-                                        })
-                                    
-                                    # Handle AI speech transcription (speech-to-text of AI response)
-                                    if sc.output_transcription and sc.output_transcription.text:
-                                        text = sc.output_transcription.text.strip()
-                                        if text:
-                                            # Store transcription in session data
-                                            if session_data:
-                                                session_data.model_transcription += text + " "
-                                            
-                                            # Calculate Time-To-First-Token for text
-                                            if turn_start_time and not first_token_received:
-                                                ttft = (time.time() - turn_start_time) * 1000
-                                                print(f"📝 TTFT: {ttft:.2f}ms")
-                                                first_token_received = True
-                                            
-                                            # Send transcription to client
-                                            await self.safe_send(websocket, {
-                                                "type": "otext", "data": text
-                                            })
-                                    
-                                    # Handle user speech transcription (speech-to-text of user input)
-                                    if sc.input_transcription and sc.input_transcription.text:
-                                        text = sc.input_transcription.text.strip()
-                                        if text:
-                                            # Store transcription in session data
-                                            if session_data:
-                                                session_data.user_transcription += text + " "
-                                            
-                                            # Start TTFT timer when VAD detects end of user speech
-                                            if not turn_start_time:
-                                                turn_start_time = time.time()
-                                                turn_count += 1
-                                                print(f"🎤 TURN {turn_count}: VAD detected")
-                                            
-                                            # Send transcription to client
-                                            await self.safe_send(websocket, {
-                                                "type": "itext", "data": text
-                                            })
-                                    
-                                    # Handle turn completion - this ends the session
-                                    if sc.turn_complete:
-                                        # Calculate total response time
-                                        if turn_start_time and first_token_received:
-                                            total_time = (time.time() - turn_start_time) * 1000
-                                            print(f"✅ TURN {turn_count} COMPLETE: {total_time:.2f}ms")
-                                        
-                                        # Notify client that turn is complete
-                                        await self.safe_send(websocket, {"type": "turn_complete"})
-                                        
-                                        # CRITICAL: Perform final logging before disconnection
-                                        print("📝 Performing final logging...")
-                                        if session_data:
-                                            session_data.finalize_and_log()
-                                        
-                                        print("✅ Session complete, disconnecting")
+                                sc = response.server_content
+                                if not sc:
+                                    continue  # Nothing else to handle (audio also lives in server_content)
+                                
+                                # Only fields that are actually set reach a handler
+                                for field, handler in content_handlers:
+                                    value = getattr(sc, field)
+                                    if value and await handler(value):
                                         return  # Exit to close session
-
-                                # Handle audio data from Gemini (AI speech)
-                                if response.data:
-                                    # Calculate Time-To-First-Token for audio
-                                    if turn_start_time and not first_token_received:
-                                        ttft = (time.time() - turn_start_time) * 1000
-                                        print(f"⚡ AUDIO TTFT: {ttft:.2f}ms")
-                                        first_token_received = True
-                                    
-                                    # Record AI audio output for analysis
-                                    if wave_files["output"]:
-                                        wave_files["output"].writeframes(response.data)
-                                    
-                                    # Send audio to client (encode as base64)
-                                    b64_audio = base64.b64encode(response.data).decode('utf-8')
-                                    await self.safe_send(websocket, {
-                                        "type": "audio", "data": b64_audio
-                                    })
+                                
+                                # response.data joins the inline audio parts, so read it once
+                                audio_data = response.data
+                                if audio_data:
+                                    await on_audio(audio_data)
 
                     # Start both tasks concurrently
                     tg.create_task(handle_messages())
@@ -462,102 +588,89 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
 
         except Exception as e:
             print(f"❌ Critical error: {e}")
-            await self.safe_send(websocket, {
+            await self.send_json(websocket, {
                 "type": "error", 
                 "data": f"Server error: {str(e)}"
             })
         finally:
-            # Clean up: close audio recording files
-            for wave_file in wave_files.values():
-                if wave_file:
-                    wave_file.close()
-            print("✅ Audio recording finished")                                session_data.model_transcription += text + " "
-                                            
-                                            # TTFT calculation
-                                            if turn_start_time and not first_token_received:
-                                                ttft = (time.time() - turn_start_time) * 1000
-                                                print(f"📝 TTFT: {ttft:.2f}ms")
-                                                first_token_received = True
-                                            
-                                            await self.safe_send(websocket, {"type": "otext", "data": text})
-                                    
-                                    if sc.input_transcription and sc.input_transcription.text:
-                                        text = sc.input_transcription.text.strip()
-                                        if text:
-                                            if session_data:
-                                                session_data.user_transcription += text + " "
-                                            
-                                            if not turn_start_time:
-                                                turn_start_time = time.time()
-                                                turn_count += 1
-                                                print(f"🎤 TURN {turn_count}: VAD detected")
-                                            
-                                            await self.safe_send(websocket, {"type": "itext", "data": text})
-                                    
-                                    # Handle turn completion
-                                    if sc.turn_complete:
-                                        if turn_start_time and first_token_received:
-                                            total_time = (time.time() - turn_start_time) * 1000
-                                            print(f"✅ TURN {turn_count} COMPLETE: {total_time:.2f}ms")
-                                        
-                                        await self.safe_send(websocket, {"type": "turn_complete"})
-                                        
-                                        # CRITICAL: Final logging before disconnection
-                                        print("📝 Performing final logging...")
-                                        if session_data:
-                                            session_data.finalize_and_log()
-                                        
-                                        print("✅ Session complete, disconnecting")
-                                        return
-
-                                # Handle audio data
-                                if response.data:
-                                    if turn_start_time and not first_token_received:
-                                        ttft = (time.time() - turn_start_time) * 1000
-                                        print(f"⚡ AUDIO TTFT: {ttft:.2f}ms")
-                                        first_token_received = True
-                                    
-                                    # Record output audio
-                                    if wave_files["output"]:
-                                        wave_files["output"].writeframes(response.data)
-                                    
-                                    # Send to client
-                                    b64_audio = base64.b64encode(response.data).decode('utf-8')
-                                    await self.safe_send(websocket, {"type": "audio", "data": b64_audio})
-
-                    # Start both tasks
-                    tg.create_task(handle_messages())
-                    tg.create_task(handle_responses())
-
-            await websocket.close(code=1000, reason="Turn complete")
-
-        except Exception as e:
-            print(f"❌ Critical error: {e}")
-            await self.safe_send(websocket, {"type": "error", "data": f"Server error: {str(e)}"})
-        finally:
-            # Close audio files
-            for wave_file in wave_files.values():
-                if wave_file:
-                    wave_file.close()
+            # Clean up: close audio recording files once all queued writes have run
+            def close_wave_files():
+                for wave_file in wave_files.values():
+                    if wave_file:
+                        wave_file.close()
+            await loop.run_in_executor(wave_executor, close_wave_files)
+            wave_executor.shutdown(wait=False)
             print("✅ Audio recording finished")
 
-async def main(save_audio: bool = True):
-    main_start_time = (time.time() - PROGRAM_START_TIME) * 1000
+def raise_open_file_limit(target=65536):
+    """Raise the soft RLIMIT_NOFILE so many concurrent client + Gemini sockets don't hit the 1024 default"""
+    try:
+        import resource  # Unix only
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        new_soft = target if hard == resource.RLIM_INFINITY else min(hard, target)
+        if new_soft > soft:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+            print(f"📂 Open file limit raised: {soft} -> {new_soft}")
+    except (ImportError, ValueError, OSError) as e:
+        print(f"⚠️ Could not raise open file limit: {e}")
+
+async def main(save_audio: bool = True, reuse_port: bool = False):
+    main_start_time = (time.monotonic_ns() - PROGRAM_START_TIME) / 1e6
     print(f"⏰ Reached main() in {main_start_time:.2f}ms")
     print("🚀 Starting WebSocket server...")
     print(f"🛠️ Available tools: {[tool['name'] for tool in TOOLS_DEFINITION]}")
+    raise_open_file_limit()
     
-    server = LiveAPIWebSocketServer(save_audio_files=save_audio)
-    await server.start()
+    # Create this process's Gemini client before accepting connections
+    get_client()
+    
+    # Start the single background writer for session logs
+    log_writer_task = asyncio.create_task(log_writer(LOG_QUEUE))
+    
+    server = LiveAPIWebSocketServer(save_audio_files=save_audio, reuse_port=reuse_port)
+    # Log records are written by this process's listener thread (started here, after any fork)
+    with queued_logging():
+        try:
+            await server.start()
+        finally:
+            # Stop the writer and write out anything still queued, so no session logs are lost on exit
+            log_writer_task.cancel()
+            flush_log_queue(LOG_QUEUE)
+
+def run_worker(save_audio):
+    """
+    Entry point for one worker process when running with --workers > 1.
+    
+    Every worker runs its own event loop and binds the same port with SO_REUSEPORT,
+    so the kernel spreads incoming connections across processes (and CPU cores).
+    """
+    try:
+        get_runner()(main(save_audio=save_audio, reuse_port=True))
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--no-save-audio", action="store_false", dest="save_audio")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of server processes sharing the port (0 = one per CPU core)")
     args = parser.parse_args()
+    workers = args.workers or os.cpu_count()
 
     try:
-        asyncio.run(main(save_audio=args.save_audio))
+        if workers > 1:
+            print(f"🧩 Starting {workers} worker processes")
+            processes = [
+                multiprocessing.Process(target=run_worker, args=(args.save_audio,))
+                for _ in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+        else:
+            get_runner()(main(save_audio=args.save_audio))
     except KeyboardInterrupt:
         print("Exiting...")
     except Exception as e:
@@ -13,20 +13,28 @@ All data is logged on the client side for comprehensive analysis.
 
 import asyncio
 import json
+import numpy as np
+import orjson
 import os
 import time
+from collections import deque
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import websockets
-import base64
-import importlib
 
 import config
 import tts_client
 from google import genai
 
-# Force reload of the config module to pick up changes
-importlib.reload(config)
+
+# Number of test cases run against the server at the same time
+MAX_CONCURRENT_TESTS = 8
+
+# Server responses kept per session in the client log (head + most recent)
+MAX_LOGGED_RESPONSES = 200
+
+# Compact control message sent after the last audio chunk (serialized once)
+END_MESSAGE = orjson.dumps({"type": "end"}).decode()
 
 
 class TestSessionLogger:
@@ -42,17 +50,34 @@ class TestSessionLogger:
     - Final results and analysis
     """
     
-    def __init__(self, log_file: str = "client_test_log.jsonl"):
+    def __init__(self, log_file: str = "client_test_log.jsonl", writer: Optional["TestSessionLogger"] = None,
+                 max_responses: Optional[int] = MAX_LOGGED_RESPONSES, truncate: bool = False,
+                 keep_details: bool = True):
         self.log_file = log_file
         self.current_session = None
+        self.max_responses = max_responses  # Cap on stored server_responses (None = keep all)
+        self.keep_details = keep_details  # False = persist only the joined transcriptions
+        self._writer = writer or self  # Logger that owns the file handle (shared by concurrent tests)
+        self._fh = None  # Long-lived buffered handle, opened on the first write
+        if truncate:
+            # Open with "w" once to clear previous logs atomically (no exists/remove race)
+            self._fh = open(log_file, "wb", buffering=65536)
+    
+    def new_session_logger(self) -> "TestSessionLogger":
+        """Create a logger for one concurrently running test that appends through this logger's handle"""
+        return TestSessionLogger(self.log_file, writer=self, max_responses=self.max_responses,
+                                 keep_details=self.keep_details)
         
     def start_session(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
         """Initialize a new test session with comprehensive tracking"""
+        max_responses = self.max_responses
+        responses_tail = deque(maxlen=max_responses - max_responses // 2) if max_responses else None
         self.current_session = {
             # Test metadata
             "test_id": test_case.get("test_id"),
             "test_case": test_case,
             "session_start_time": time.time(),
+            "_session_start_mono_ns": time.monotonic_ns(),  # Base for time_since_session_start_ms
             "session_start_timestamp": datetime.now().isoformat(),
             
             # Input data
@@ -66,7 +91,9 @@ class TestSessionLogger:
             "audio_streaming_end_time": None,
             
             # Response tracking
-            "server_responses": [],           # All raw server responses
+            "server_responses": [],           # Server responses (first half of max_responses)...
+            "_responses_tail": responses_tail,  # ...plus the most recent ones, merged at finalize
+            "server_responses_dropped": 0,    # Responses beyond the cap that were not kept
             "input_transcriptions": [],       # User speech transcriptions
             "output_transcriptions": [],      # AI speech transcriptions
             "tool_calls_detected": [],        # Tool calls observed
@@ -94,23 +121,41 @@ class TestSessionLogger:
             self.current_session["audio_chunks_sent"] += 1
     
     def log_server_response(self, response_type: str, data: Any):
-        """Log all server responses with timestamps"""
-        if self.current_session:
+        """
+        Log server responses with timestamps.
+        
+        Audio payloads are recorded by size only. Once max_responses is reached, the
+        first half is kept as-is and only the most recent entries are retained after it.
+        """
+        session = self.current_session
+        if session:
+            now = time.time()
             response_entry = {
-                "timestamp": time.time(),
+                "timestamp": now,
                 "type": response_type,
-                "data": data,
-                "time_since_session_start": time.time() - self.current_session["session_start_time"]
+                "time_since_session_start_ms": (time.monotonic_ns() - session["_session_start_mono_ns"]) / 1e6
             }
-            self.current_session["server_responses"].append(response_entry)
+            if response_type == "audio":
+                response_entry["size"] = len(data) if data else 0
+            else:
+                response_entry["data"] = data
+            
+            tail = session["_responses_tail"]
+            if tail is None or len(session["server_responses"]) < self.max_responses // 2:
+                session["server_responses"].append(response_entry)
+            else:
+                if len(tail) == tail.maxlen:
+                    session["server_responses_dropped"] += 1
+                tail.append(response_entry)
     
     def log_transcription(self, transcription_type: str, text: str):
         """Log transcriptions (input/output) with timing"""
         if self.current_session:
+            now = time.time()
             transcription_entry = {
-                "timestamp": time.time(),
+                "timestamp": now,
                 "text": text,
-                "time_since_session_start": time.time() - self.current_session["session_start_time"]
+                "time_since_session_start_ms": (time.monotonic_ns() - self.current_session["_session_start_mono_ns"]) / 1e6
             }
             
             if transcription_type == "input":
@@ -121,28 +166,30 @@ class TestSessionLogger:
                 # Calculate TTFT if this is the first output transcription
                 if (self.current_session["time_to_first_token"] is None and 
                     self.current_session["audio_streaming_end_time"]):
-                    ttft = (time.time() - self.current_session["audio_streaming_end_time"]) * 1000
+                    ttft = (now - self.current_session["audio_streaming_end_time"]) * 1000
                     self.current_session["time_to_first_token"] = ttft
     
     def log_tool_call(self, tool_name: str, arguments: Any = None):
         """Log detected tool calls"""
         if self.current_session:
+            now = time.time()
             tool_call_entry = {
-                "timestamp": time.time(),
+                "timestamp": now,
                 "tool_name": tool_name,
                 "arguments": arguments,
-                "time_since_session_start": time.time() - self.current_session["session_start_time"]
+                "time_since_session_start_ms": (time.monotonic_ns() - self.current_session["_session_start_mono_ns"]) / 1e6
             }
             self.current_session["tool_calls_detected"].append(tool_call_entry)
     
     def log_error(self, error_message: str, error_type: str = "general"):
         """Log errors during the session"""
         if self.current_session:
+            now = time.time()
             error_entry = {
-                "timestamp": time.time(),
+                "timestamp": now,
                 "type": error_type,
                 "message": error_message,
-                "time_since_session_start": time.time() - self.current_session["session_start_time"]
+                "time_since_session_start_ms": (time.monotonic_ns() - self.current_session["_session_start_mono_ns"]) / 1e6
             }
             self.current_session["errors"].append(error_entry)
     
@@ -159,35 +206,57 @@ class TestSessionLogger:
                             self.current_session["audio_streaming_end_time"]) * 1000
                 self.current_session["total_response_time"] = total_time
             
-            # Aggregate transcriptions
+            self.current_session.pop("_session_start_mono_ns", None)
+            
+            # Merge the retained most-recent responses back after the head
+            tail = self.current_session.pop("_responses_tail", None)
+            if tail:
+                self.current_session["server_responses"].extend(tail)
+            
+            # Aggregate transcriptions in one pass over the entries (no intermediate list)
+            if self.keep_details:
+                input_entries = self.current_session["input_transcriptions"]
+                output_entries = self.current_session["output_transcriptions"]
+            else:
+                # Minimal record: keep only the joined text, not every timed entry
+                input_entries = self.current_session.pop("input_transcriptions")
+                output_entries = self.current_session.pop("output_transcriptions")
+            
             self.current_session["complete_input_transcription"] = " ".join(
-                [t["text"] for t in self.current_session["input_transcriptions"]]
+                t["text"] for t in input_entries
             ).strip()
             
             self.current_session["complete_output_transcription"] = " ".join(
-                [t["text"] for t in self.current_session["output_transcriptions"]]
+                t["text"] for t in output_entries
             ).strip()
             
             # Mark session as completed
             self.current_session["session_completed"] = True
             self.current_session["success"] = success
-            self.current_session["session_end_time"] = time.time()
-            self.current_session["session_duration"] = (
-                self.current_session["session_end_time"] - 
-                self.current_session["session_start_time"]
-            )
+            self.current_session["session_end_time"] = end_time = time.time()
+            self.current_session["session_duration"] = end_time - self.current_session["session_start_time"]
             
             # Write to log file
             self._write_session_to_log()
     
     def _write_session_to_log(self):
-        """Write the complete session data to JSONL log file"""
+        """Append the complete session data to the JSONL log (buffered; flushed by close())"""
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(self.current_session, ensure_ascii=False) + "\n")
+            # One synchronous write per session, so lines from concurrent tests never interleave
+            writer = self._writer
+            if writer._fh is None:
+                writer._fh = open(writer.log_file, "ab", buffering=65536)
+            # orjson writes UTF-8 bytes directly (non-ASCII kept as-is, like ensure_ascii=False)
+            writer._fh.write(orjson.dumps(self.current_session) + b"\n")
             print(f"📝 Session logged to {self.log_file}")
         except Exception as e:
             print(f"❌ Failed to write session log: {e}")
+    
+    def close(self):
+        """Flush and close the log file handle"""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
 
 
 def load_test_cases_from_json(file_path: str) -> List[Dict[str, Any]]:
@@ -205,13 +274,14 @@ def load_test_cases_from_json(file_path: str) -> List[Dict[str, Any]]:
         return []
 
 
-async def run_single_test_case(test_case: Dict[str, Any], logger: TestSessionLogger) -> bool:
+async def run_single_test_case(test_case: Dict[str, Any], logger: TestSessionLogger, verbose: bool = False) -> bool:
     """
     Execute a single test case with comprehensive logging.
     
     Args:
         test_case: The test case configuration
         logger: Session logger instance
+        verbose: Print every transcription/audio frame as it arrives
         
     Returns:
         bool: True if test completed successfully, False otherwise
@@ -221,137 +291,180 @@ async def run_single_test_case(test_case: Dict[str, Any], logger: TestSessionLog
     print(f"🚀 Starting test: {test_case['test_id']} - '{test_case['spoken_text']}'")
     
     try:
-        # Generate audio from text
-        print("🎤 Converting text to audio...")
-        audio_content = tts_client.convert_text_to_audio(test_case["spoken_text"])
-        
-        if not audio_content:
-            logger.log_error("TTS conversion failed", "tts_error")
-            logger.finalize_session(success=False)
-            return False
-        
-        print(f"✅ Generated {len(audio_content)} bytes of audio")
-        
         # Connect to WebSocket server
         live_api_endpoint = "ws://localhost:8765"
         print(f"🔌 Connecting to WebSocket at: {live_api_endpoint}")
         
         async with websockets.connect(live_api_endpoint) as websocket:
             # Send test initialization
-            await websocket.send(json.dumps({
+            await websocket.send(orjson.dumps({
                 "type": "start_test",
                 "test_id": test_case['test_id']
-            }))
+            }).decode())
             logger.log_server_response("start_test_sent", test_case['test_id'])
             
-            # Start audio streaming
-            chunk_size = 1024  # Send 1KB chunks
-            total_chunks = (len(audio_content) + chunk_size - 1) // chunk_size
-            print(f"📡 Streaming {len(audio_content)} bytes in {total_chunks} chunks...")
+            # Stream audio while TTS is still synthesizing it, so TTS time overlaps the send
+            # Send 80ms of audio per frame (16-bit PCM) and pace batches in real time
+            audio_bytes_per_second = config.TTS_SAMPLE_RATE * 2
+            batch_seconds = 0.08
+            chunk_size = int(audio_bytes_per_second * batch_seconds)
+            print("🎤 Streaming text-to-speech audio...")
             
-            # Stream audio data
-            for i in range(0, len(audio_content), chunk_size):
-                chunk = audio_content[i:i+chunk_size]
-                audio_b64 = base64.b64encode(chunk).decode('utf-8')
-                
-                await websocket.send(json.dumps({
-                    "type": "audio",
-                    "data": audio_b64
-                }))
-                
-                logger.log_audio_chunk(len(chunk))
-                await asyncio.sleep(0.02)  # Simulate real-time streaming
+            async def send_chunks(audio):
+                """Send all whole batches of audio; return the leftover tail (< chunk_size)"""
+                # Stream as tagged binary frames (raw PCM, no base64/JSON);
+                # slicing a memoryview avoids allocating a copy of every chunk
+                audio_view = memoryview(audio)
+                whole = len(audio_view) - len(audio_view) % chunk_size
+                for i in range(0, whole, chunk_size):
+                    chunk = audio_view[i:i+chunk_size]
+                    await websocket.send(config.AUDIO_FRAME_TAG + chunk)
+                    
+                    logger.log_audio_chunk(len(chunk))
+                    await asyncio.sleep(batch_seconds)  # Simulate real-time streaming
+                return bytes(audio_view[whole:])
+            
+            leftover = b""
+            try:
+                async for audio_piece in tts_client.stream_audio(test_case["spoken_text"]):
+                    leftover = await send_chunks(leftover + audio_piece if leftover else audio_piece)
+            except Exception as e:
+                print(f"❌ TTS streaming failed: {e}")
+                logger.log_error(f"TTS conversion failed: {e}", "tts_error")
+                logger.finalize_session(success=False)
+                return False
+            
+            # Send the final partial batch
+            if leftover:
+                await websocket.send(config.AUDIO_FRAME_TAG + leftover)
+                logger.log_audio_chunk(len(leftover))
+            
+            print(f"📡 Streamed {session['audio_total_bytes']} bytes in {session['audio_chunks_sent']} chunks")
             
             # Mark end of audio streaming
             session["audio_streaming_end_time"] = time.time()
             
             # Signal end of audio
-            await websocket.send(json.dumps({"type": "end"}))
+            await websocket.send(END_MESSAGE)
             logger.log_server_response("end_signal_sent", "audio_stream_complete")
             print("🏁 Finished streaming audio, waiting for response...")
             
+            # Handlers for each server message type; a handler returns True to end the test
+            def on_itext(data):
+                # Input transcription (user speech)
+                text = data.get("data", "")
+                if verbose:
+                    print(f"👤 User transcription: '{text}'")
+                logger.log_transcription("input", text)
+            
+            def on_otext(data):
+                # Output transcription (AI speech)
+                text = data.get("data", "")
+                if verbose:
+                    print(f"🤖 AI transcription: '{text}'")
+                logger.log_transcription("output", text)
+            
+            def on_audio(data=None):
+                # Audio response from AI
+                session["audio_responses_received"] += 1
+                if verbose and session["audio_responses_received"] == 1:
+                    print("🔊 First audio response received")
+            
+            def on_tool_call(data):
+                # Tool call detection (if server sends this info)
+                tool_data = data.get("data", {})
+                tool_name = tool_data.get("name", "unknown")
+                tool_args = tool_data.get("arguments")
+                print(f"🛠️ Tool call detected: {tool_name}")
+                logger.log_tool_call(tool_name, tool_args)
+            
+            def on_interrupted(data):
+                print("🤐 Response was interrupted")
+                logger.log_server_response("interrupted", data.get("data"))
+            
+            def on_error(data):
+                error_msg = data.get("data", "Unknown error")
+                print(f"❌ Server error: {error_msg}")
+                logger.log_error(error_msg, "server_error")
+            
+            def on_turn_complete(data):
+                session["turn_complete_time"] = time.time()
+                # One aggregated summary instead of a print per frame
+                print(f"✅ Turn completed by server ({session['audio_responses_received']} audio chunks)")
+                logger.log_server_response("turn_complete", "session_ended")
+                return True
+            
+            def on_ready(data):
+                print("✅ Server ready for next request")
+                return True
+            
+            handlers = {
+                "itext": on_itext,
+                "otext": on_otext,
+                "audio": on_audio,
+                "tool_call": on_tool_call,
+                "interrupted": on_interrupted,
+                "error": on_error,
+                "turn_complete": on_turn_complete,
+                "session_complete": on_turn_complete,
+                "ready": on_ready,
+            }
+            
             # Process server responses
-            response_timeout = 30.0  # 30 second timeout
-            start_wait_time = time.time()
-            
-            while True:
-                try:
-                    # Calculate remaining timeout
-                    elapsed = time.time() - start_wait_time
-                    remaining_timeout = max(0.1, response_timeout - elapsed)
-                    
-                    message = await asyncio.wait_for(websocket.recv(), timeout=remaining_timeout)
-                    data = json.loads(message)
-                    message_type = data.get("type")
-                    
-                    # Log all server responses
-                    logger.log_server_response(message_type, data.get("data"))
-                    
-                    # Handle specific message types
-                    if message_type == "itext":
-                        # Input transcription (user speech)
-                        text = data.get("data", "")
-                        print(f"👤 User transcription: '{text}'")
-                        logger.log_transcription("input", text)
-                        
-                    elif message_type == "otext":
-                        # Output transcription (AI speech)
-                        text = data.get("data", "")
-                        print(f"🤖 AI transcription: '{text}'")
-                        logger.log_transcription("output", text)
-                        
-                    elif message_type == "audio":
-                        # Audio response from AI
-                        session["audio_responses_received"] += 1
-                        if session["audio_responses_received"] == 1:
-                            print("🔊 First audio response received")
-                        
-                    elif message_type == "tool_call":
-                        # Tool call detection (if server sends this info)
-                        tool_data = data.get("data", {})
-                        tool_name = tool_data.get("name", "unknown")
-                        tool_args = tool_data.get("arguments")
-                        print(f"🛠️ Tool call detected: {tool_name}")
-                        logger.log_tool_call(tool_name, tool_args)
-                        
-                    elif message_type == "interrupted":
-                        print("🤐 Response was interrupted")
-                        logger.log_server_response("interrupted", data.get("data"))
-                        
-                    elif message_type == "error":
-                        error_msg = data.get("data", "Unknown error")
-                        print(f"❌ Server error: {error_msg}")
-                        logger.log_error(error_msg, "server_error")
-                        
-                    elif message_type == "turn_complete" or message_type == "session_complete":
+            response_timeout = 30.0  # 30 second timeout for the whole response
+            
+            try:
+                # One deadline for the whole receive loop (no per-frame wait_for task)
+                async with asyncio.timeout(response_timeout):
+                    async for message in websocket:
+                        try:
+                            # Binary frames carry tagged raw PCM audio from the server
+                            if isinstance(message, bytes):
+                                if message[:1] == config.AUDIO_FRAME_TAG:
+                                    logger.log_server_response("audio", memoryview(message)[1:])
+                                    on_audio()
+                                continue
+                            
+                            data = orjson.loads(message)
+                            
+                            # The server may coalesce several messages into one "batch" frame
+                            items = data.get("items", ()) if data.get("type") == "batch" else (data,)
+                            done = False
+                            for item in items:
+                                message_type = item.get("type")
+                                
+                                # Log all server responses
+                                logger.log_server_response(message_type, item.get("data"))
+                                
+                                # Dispatch on message type (unknown types are only logged)
+                                handler = handlers.get(message_type)
+                                if handler is not None and handler(item):
+                                    done = True
+                                    break
+                            if done:
+                                break
+                            
+                        except json.JSONDecodeError as e:
+                            print(f"❌ Invalid JSON from server: {e}")
+                            logger.log_error(f"JSON decode error: {e}", "json_error")
+                            continue
+                            
+                        except Exception as e:
+                            print(f"❌ Error processing server response: {e}")
+                            logger.log_error(f"Response processing error: {e}", "processing_error")
+                            break
+                    else:
+                        # Iteration ends when the server closes the connection normally
+                        print("🔌 Connection closed by server")
                         session["turn_complete_time"] = time.time()
-                        print("✅ Turn completed by server")
-                        logger.log_server_response("turn_complete", "session_ended")
-                        break
-                        
-                    elif message_type == "ready":
-                        print("✅ Server ready for next request")
-                        break
-                    
-                except asyncio.TimeoutError:
-                    print(f"⏰ Timeout waiting for server response ({response_timeout}s)")
-                    logger.log_error(f"Response timeout after {response_timeout}s", "timeout")
-                    break
-                    
-                except websockets.exceptions.ConnectionClosed:
-                    print("🔌 Connection closed by server")
-                    session["turn_complete_time"] = time.time()
-                    break
-                    
-                except json.JSONDecodeError as e:
-                    print(f"❌ Invalid JSON from server: {e}")
-                    logger.log_error(f"JSON decode error: {e}", "json_error")
-                    continue
-                    
-                except Exception as e:
-                    print(f"❌ Error processing server response: {e}")
-                    logger.log_error(f"Response processing error: {e}", "processing_error")
-                    break
+                
+            except TimeoutError:
+                print(f"⏰ Timeout waiting for server response ({response_timeout}s)")
+                logger.log_error(f"Response timeout after {response_timeout}s", "timeout")
+                
+            except websockets.exceptions.ConnectionClosed:
+                print("🔌 Connection closed by server")
+                session["turn_complete_time"] = time.time()
         
         # Session completed successfully
         logger.finalize_session(success=True)
@@ -364,38 +477,44 @@ async def run_single_test_case(test_case: Dict[str, Any], logger: TestSessionLog
         return False
 
 
-async def run_test_cases(test_cases: List[Dict[str, Any]]):
+async def run_test_cases(test_cases: List[Dict[str, Any]], max_concurrency: int = MAX_CONCURRENT_TESTS,
+                         verbose: bool = False, keep_details: bool = True):
     """
     Execute all test cases with comprehensive logging.
+    
+    Tests are independent (own WebSocket, own session log entry), so up to
+    max_concurrency of them run at the same time. verbose enables per-frame output;
+    keep_details=False logs only the joined transcriptions of each session.
     """
     # Initialize logger
-    logger = TestSessionLogger()
-    
-    # Clear previous logs
-    if os.path.exists(logger.log_file):
-        os.remove(logger.log_file)
-        print(f"🗑️ Cleared previous log file: {logger.log_file}")
+    logger = TestSessionLogger(truncate=True, keep_details=keep_details)
+    print(f"🗑️ Cleared previous log file: {logger.log_file}")
     
-    successful_tests = 0
     total_tests = len(test_cases)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_bounded(i, test_case):
+        async with semaphore:
+            print(f"\n--- Test Case {i}/{total_tests} ---")
+            
+            success = await run_single_test_case(test_case, logger.new_session_logger(), verbose)
+            if success:
+                print(f"✅ Test {i} completed successfully")
+            else:
+                print(f"❌ Test {i} failed")
+            return success
     
-    print(f"\n🎯 Starting execution of {total_tests} test cases")
+    print(f"\n🎯 Starting execution of {total_tests} test cases ({max_concurrency} at a time)")
     print("=" * 60)
     
-    for i, test_case in enumerate(test_cases, 1):
-        print(f"\n--- Test Case {i}/{total_tests} ---")
-        
-        success = await run_single_test_case(test_case, logger)
-        if success:
-            successful_tests += 1
-            print(f"✅ Test {i} completed successfully")
-        else:
-            print(f"❌ Test {i} failed")
-        
-        # Brief pause between tests
-        if i < total_tests:
-            print("⏸️ Pausing before next test...")
-            await asyncio.sleep(2)
+    try:
+        results = await asyncio.gather(*(
+            run_bounded(i, test_case) for i, test_case in enumerate(test_cases, 1)
+        ))
+        successful_tests = sum(results)
+    finally:
+        # Flush buffered session logs before the analysis reads them
+        logger.close()
     
     # Final summary
     print("\n" + "=" * 60)
@@ -419,47 +538,45 @@ def analyze_results_from_client_log(test_cases: List[Dict[str, Any]], log_file:
         print(f"❌ Error: Client log file not found at {log_file}")
         return
     
-    # Load all session logs
-    session_logs = []
+    # Stream the log one line at a time straight into a lookup by test_id
+    # (later sessions for the same test_id replace earlier ones)
+    sessions_by_id = {}
     try:
         with open(log_file, 'r', encoding='utf-8') as f:
             for line in f:
-                session_logs.append(json.loads(line.strip()))
+                if line.strip():
+                    session = orjson.loads(line)
+                    sessions_by_id[session['test_id']] = session
     except Exception as e:
         print(f"❌ Error reading log file: {e}")
         return
     
-    # Create lookup by test_id
-    sessions_by_id = {session['test_id']: session for session in session_logs}
-    
     # Analysis metrics
     total_tests = len(test_cases)
     successful_tests = 0
-    failed_tests = 0
     tool_call_accuracy = 0
-    total_response_times = []
-    total_ttft_times = []
+    # Timings per test case (NaN = not recorded), filled in the single pass below
+    total_ttft_times = np.full(total_tests, np.nan)
+    total_response_times = np.full(total_tests, np.nan)
+    
+    # Join each test case with its session once (build on sessions_by_id, then probe)
+    joined = [(test_case, sessions_by_id.get(test_case['test_id'])) for test_case in test_cases]
     
     print(f"\n📋 Detailed Test Results:")
     print("-" * 60)
     
-    for test_case in test_cases:
-        test_id = test_case['test_id']
+    for i, (test_case, session) in enumerate(joined):
         expected_tool = test_case['expected_tool']
         
-        print(f"\n🧪 Test {test_id}: {test_case['spoken_text']}")
+        print(f"\n🧪 Test {test_case['test_id']}: {test_case['spoken_text']}")
         
-        if test_id not in sessions_by_id:
+        if session is None:
             print("   ❌ FAILED: No session log found")
-            failed_tests += 1
             continue
         
-        session = sessions_by_id[test_id]
-        
         # Check if session completed successfully
         if not session.get('session_completed', False):
             print("   ❌ FAILED: Session did not complete")
-            failed_tests += 1
             continue
         
         # Analyze transcriptions
@@ -485,11 +602,11 @@ def analyze_results_from_client_log(test_cases: List[Dict[str, Any]], log_file:
         
         if ttft:
             print(f"   ⚡ Time to First Token: {ttft:.2f}ms")
-            total_ttft_times.append(ttft)
+            total_ttft_times[i] = ttft
         
         if total_time:
             print(f"   ⏱️ Total Response Time: {total_time:.2f}ms")
-            total_response_times.append(total_time)
+            total_response_times[i] = total_time
         
         # Error analysis
         errors = session.get('errors', [])
@@ -504,7 +621,9 @@ def analyze_results_from_client_log(test_cases: List[Dict[str, Any]], log_file:
             successful_tests += 1
         else:
             print("   ❌ FAILED")
-            failed_tests += 1
+    
+    # Every test case that did not pass counted as failed above
+    failed_tests = total_tests - successful_tests
     
     # Overall Statistics
     print("\n" + "=" * 60)
@@ -518,22 +637,32 @@ def analyze_results_from_client_log(test_cases: List[Dict[str, Any]], log_file:
     print(f"🎯 Success Rate: {(successful_tests/total_tests)*100:.1f}%")
     print(f"🛠️ Tool Call Accuracy: {(tool_call_accuracy/total_tests)*100:.1f}%")
     
-    if total_ttft_times:
-        avg_ttft = sum(total_ttft_times) / len(total_ttft_times)
-        print(f"⚡ Average TTFT: {avg_ttft:.2f}ms")
-        print(f"⚡ Min TTFT: {min(total_ttft_times):.2f}ms")
-        print(f"⚡ Max TTFT: {max(total_ttft_times):.2f}ms")
+    ttft_arr = total_ttft_times[~np.isnan(total_ttft_times)]
+    if ttft_arr.size:
+        p50, p90, p99 = np.percentile(ttft_arr, (50, 90, 99))
+        print(f"⚡ Average TTFT: {ttft_arr.mean():.2f}ms")
+        print(f"⚡ Min TTFT: {ttft_arr.min():.2f}ms")
+        print(f"⚡ Max TTFT: {ttft_arr.max():.2f}ms")
+        print(f"⚡ TTFT p50/p90/p99: {p50:.2f} / {p90:.2f} / {p99:.2f}ms")
     
-    if total_response_times:
-        avg_response = sum(total_response_times) / len(total_response_times)
-        print(f"⏱️ Average Response Time: {avg_response:.2f}ms")
-        print(f"⏱️ Min Response Time: {min(total_response_times):.2f}ms")
-        print(f"⏱️ Max Response Time: {max(total_response_times):.2f}ms")
+    response_arr = total_response_times[~np.isnan(total_response_times)]
+    if response_arr.size:
+        p50, p90, p99 = np.percentile(response_arr, (50, 90, 99))
+        print(f"⏱️ Average Response Time: {response_arr.mean():.2f}ms")
+        print(f"⏱️ Min Response Time: {response_arr.min():.2f}ms")
+        print(f"⏱️ Max Response Time: {response_arr.max():.2f}ms")
+        print(f"⏱️ Response Time p50/p90/p99: {p50:.2f} / {p90:.2f} / {p99:.2f}ms")
     
     print("=" * 60)
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minimal-log", action="store_false", dest="keep_details",
+                        help="Log only the joined transcriptions, not every timed transcription entry")
+    args = parser.parse_args()
+    
     # Load test cases
     script_dir = os.path.dirname(os.path.abspath(__file__))
     test_cases_path = os.path.join(script_dir, "test_cases.json")
@@ -544,7 +673,7 @@ if __name__ == "__main__":
         exit(1)
     
     # Execute test cases with comprehensive logging
-    asyncio.run(run_test_cases(test_cases))
+    asyncio.run(run_test_cases(test_cases, keep_details=args.keep_details))
     
     # Analyze results using detailed client logs
     analyze_results_from_client_log(test_cases)
\ No newline at end of file
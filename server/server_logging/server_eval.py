@@ -1,18 +1,21 @@
 import asyncio
-import json
-import base64
+import functools
+import orjson
 import os
 import time
+import uuid
 import wave
-from datetime import datetime
+from binascii import a2b_base64
+from concurrent.futures import ThreadPoolExecutor
+from websockets.exceptions import ConnectionClosed
 
 # Record program start time
-PROGRAM_START_TIME = time.time()
-print(f"🚀 PROGRAM STARTED at {PROGRAM_START_TIME:.3f}")
+PROGRAM_START_TIME = time.monotonic_ns()  # Base for startup durations (not wall-clock time)
+print(f"🚀 PROGRAM STARTED at {time.time():.3f}")
 
 # Import Google Generative AI components
 print("🔧 Initializing Google Generative AI client...")
-client_init_start = time.time()
+client_init_start = time.monotonic_ns()
 from google import genai
 from google.genai import types  # CRITICAL: Import types for new API format
 from google.genai.types import (
@@ -32,13 +35,20 @@ from config import (
     VOICE_NAME,
     SEND_SAMPLE_RATE,
     SYSTEM_INSTRUCTION,
+    AUDIO_FRAME_TAG,
+    LOG_QUEUE,
+    log_writer,
+    flush_log_queue,
+    get_runner,
+    queued_logging,
 )
 from tools import TOOLS_DEFINITION
+from tools_registry import validate_tool_arguments
 import config
 
 # Initialize Google client
 client = genai.Client(vertexai=True, project=PROJECT_ID, location=LOCATION)
-client_init_time = (time.time() - client_init_start) * 1000
+client_init_time = (time.monotonic_ns() - client_init_start) / 1e6
 print(f"✅ Google client initialized in {client_init_time:.2f}ms")
 
 
@@ -67,59 +77,129 @@ CONFIG = {
     },
 }
 
+# Validate the config (including TOOLS_DEFINITION) into the SDK's typed objects once instead of on every connect
+LIVE_CONFIG = types.LiveConnectConfig(**CONFIG)
+
+AUDIO_MIME = f"audio/pcm;rate={SEND_SAMPLE_RATE}"  # Fixed format of forwarded client audio
+
+# Outbound WebSocket coalescing: messages queued within this window go out as one
+# {"type": "batch", "items": [...]} frame (at most OUTBOUND_BATCH_MAX messages each)
+OUTBOUND_BATCH_MAX = 32
+OUTBOUND_BATCH_WINDOW = 0.005  # seconds
+
+# Fixed messages, serialized once
+PONG_MSG = orjson.dumps({"type": "pong"}).decode()
+TURN_COMPLETE_MSG = orjson.dumps({"type": "turn_complete"}).decode()
+INTERRUPTED_MSG = orjson.dumps({"type": "interrupted", "data": "Response interrupted by user input"}).decode()
+
+
+def otext_message(text):
+    """Serialized model transcription message"""
+    return '{"type":"otext","data":' + orjson.dumps(text).decode() + "}"
+
+
+def itext_message(text):
+    """Serialized user transcription message"""
+    return '{"type":"itext","data":' + orjson.dumps(text).decode() + "}"
+
+
+def guarded_send(send):
+    """Report (instead of raise) send failures; the wrapped send returns True on success"""
+    @functools.wraps(send)
+    async def wrapper(self, websocket, payload):
+        try:
+            # websockets tracks the connection state itself and raises once it is closed
+            await send(self, websocket, payload)
+            return True
+        except ConnectionClosed:
+            print(f"⚠️ WebSocket not open, skipping message")
+            return False
+        except Exception as e:
+            print(f"⚠️ WebSocket send error: {e}")
+            return False
+    return wrapper
+
+# Write buffer for the recorded WAV files, so chunk writes rarely reach the disk
+WAV_BUFFER_BYTES = 1 << 20
+
+def open_wave_file(filename, frame_rate):
+    """Open a mono 16-bit WAV writer on a buffered file; returns (wave_file, file_object)"""
+    fp = open(filename, 'wb', buffering=WAV_BUFFER_BYTES)
+    wave_file = wave.open(fp, 'wb')
+    wave_file.setnchannels(1)
+    wave_file.setsampwidth(2) # 16-bit
+    wave_file.setframerate(frame_rate)
+    return wave_file, fp
+
+def write_wave_frames(wave_file, audio_bytes):
+    """Append PCM to a WAV file (runs on the WAV executor, so errors are reported here)"""
+    try:
+        wave_file.writeframes(audio_bytes)
+    except Exception as e:
+        print(f"❌ Error writing to wave file: {e}")
+
+def no_audio_write(audio_bytes):
+    """Stands in for the WAV writers when recording is disabled"""
+
+def close_wave_file(wave_file, fp):
+    """Finish the WAV header and close the file (wave does not close file objects it was given)"""
+    wave_file.close()
+    fp.close()
+
 class LiveAPIWebSocketServer(BaseWebSocketServer):
     """WebSocket server implementation using Gemini LiveAPI directly."""
 
     def __init__(self, host="0.0.0.0", port=8765, save_audio_files=True):
         super().__init__(host, port)
-        self.session = None
-        self.current_test_id = None
         self.save_audio_files = save_audio_files
 
-    async def safe_websocket_send(self, websocket, message):
-        """Safely send message to WebSocket with error handling"""
-        try:
-            if hasattr(websocket, 'open') and websocket.open:
-                if isinstance(message, dict):
-                    message = json.dumps(message)
-                await websocket.send(message)
-                return True
-            else:
-                print(f"⚠️ WebSocket not open, skipping message")
-                return False
-        except Exception as e:
-            print(f"⚠️ WebSocket send error: {e}")
-            return False
+    @guarded_send
+    async def _send_audio(self, websocket, pcm):
+        """Send raw PCM as a tagged binary frame"""
+        await websocket.send(AUDIO_FRAME_TAG + pcm)
+
+    @guarded_send
+    async def _send_text(self, websocket, message):
+        """Send an already-serialized JSON message as a text frame"""
+        await websocket.send(message)
 
-    async def handle_tool_calls(self, response, websocket, model_transcription):
+    @guarded_send
+    async def _send_error(self, websocket, error):
+        """Send an error message to the client"""
+        await websocket.send('{"type":"error","data":' + orjson.dumps(error).decode() + "}")
+
+    async def handle_tool_calls(self, session, response, websocket, test_id, model_transcription):
         """Handle tool calls from the Gemini model - FIXED with error handling"""
+        # session and test_id come from the calling connection: this server object is shared by all clients
         if response.tool_call:
-            tool_call_start = time.time()
+            tool_call_start = time.monotonic_ns()
             function_responses = []
             
             print(f"\n🔧 Processing {len(response.tool_call.function_calls)} tool call(s)")
             
             for fc in response.tool_call.function_calls:
-                func_start = time.time()
+                func_start = time.monotonic_ns()
                 print(f"🛠️ Executing tool: {fc.name}")
                 
                 response_data = {"result": "Function executed successfully"}
+                func_time_ms = round((time.monotonic_ns() - func_start) / 1e6, 2)
 
                 # --- START: Required modification for logging ---
                 log_entry = {
-                    "test_id": self.current_test_id,
+                    "test_id": test_id,
                     "timestamp_utc": time.time(),
                     "tool_name": fc.name,
                     "arguments": fc.args if hasattr(fc, 'args') and fc.args else None,
-                    "execution_time_ms": round((time.time() - func_start) * 1000, 2),
+                    # Schema problems with the model's arguments (validators are built once at import)
+                    "argument_errors": validate_tool_arguments(fc.name, fc.args),
+                    "execution_time_ms": func_time_ms,
                     "model_response_transcription": model_transcription.strip()
                 }
                 
-                # Log the function call to the shared log file
+                # Queue the function call for the shared log file
                 try:
-                    with open(config.SERVER_LOG_FILE, "a") as f:
-                        f.write(json.dumps(log_entry) + "\n")
-                    print(f"📝 Logged function call: {fc.name} (took {(time.time() - func_start) * 1000:.2f}ms)")
+                    LOG_QUEUE.put_nowait(orjson.dumps(log_entry) + b"\n")
+                    print(f"📝 Logged function call: {fc.name} (took {func_time_ms:.2f}ms)")
                 except Exception as log_error:
                     print(f"❌ Failed to log function call: {log_error}")
                 # --- END: Required modification for logging ---
@@ -133,18 +213,17 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
 
             # Send tool responses back to the session
             try:
-                await self.session.send_tool_response(function_responses=function_responses)
+                await session.send_tool_response(function_responses=function_responses)
                 print(f"📤 Sent function responses to Gemini")
             except Exception as e:
                 print(f"❌ Failed to send function responses: {e}")
             
-            total_tool_time = (time.time() - tool_call_start) * 1000
+            total_tool_time = (time.monotonic_ns() - tool_call_start) / 1e6
             print(f"🔧 All tool calls completed in {total_tool_time:.2f}ms")
 
     async def process_audio(self, websocket, client_id):
         # Calculate and display startup metrics on first connection
-        connection_time = time.time()
-        startup_time = (connection_time - PROGRAM_START_TIME) * 1000
+        startup_time = (time.monotonic_ns() - PROGRAM_START_TIME) / 1e6
         print(f"🔌 WEBSOCKET READY! Total startup time: {startup_time:.2f}ms")
         
         # TTFT tracking variables
@@ -152,22 +231,27 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
         turn_start_time = None
         first_token_received = False
         turn_count = 0
+        test_id = None  # Set by this client's start_test message
         
         # Store reference to client
         self.active_clients[client_id] = websocket
 
+        # WAV writes run here, in order, so they never block the event loop
+        wave_executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+
+        # One timestamp names both recordings of this connection; the uuid suffix keeps
+        # concurrent connections opened in the same second from overwriting each other
+        timestamp = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
         # --- Audio Recording Setup ---
-        wave_file = None
+        wave_file = wave_fp = None
         if self.save_audio_files:
             try:
                 os.makedirs(config.RESULTS_DIR, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 audio_filename = os.path.join(config.RESULTS_DIR, f"received_audio_{timestamp}.wav")
                 
-                wave_file = wave.open(audio_filename, 'wb')
-                wave_file.setnchannels(1)
-                wave_file.setsampwidth(2) # 16-bit
-                wave_file.setframerate(SEND_SAMPLE_RATE)
+                wave_file, wave_fp = open_wave_file(audio_filename, SEND_SAMPLE_RATE)
                 print(f"🎤 Recording incoming audio to {audio_filename}")
             except Exception as e:
                 print(f"❌ Failed to set up audio recording: {e}")
@@ -175,111 +259,168 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
         # --- End Audio Recording Setup ---
 
         # --- Model Output Audio Recording Setup ---
-        output_wave_file = None
+        output_wave_file = output_wave_fp = None
         if self.save_audio_files:
             try:
                 # The results directory is already created above
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 output_audio_filename = os.path.join(config.RESULTS_DIR, f"model_output_audio_{timestamp}.wav")
                 
-                output_wave_file = wave.open(output_audio_filename, 'wb')
-                output_wave_file.setnchannels(1)
-                output_wave_file.setsampwidth(2) # 16-bit
-                output_wave_file.setframerate(24000) # As per documentation
+                output_wave_file, output_wave_fp = open_wave_file(output_audio_filename, 24000) # As per documentation
                 print(f"🎤 Recording model output audio to {output_audio_filename}")
             except Exception as e:
                 print(f"❌ Failed to set up model output audio recording: {e}")
                 output_wave_file = None
         # --- End Model Output Audio Recording Setup ---
 
+        # Pick the audio writers once, so the per-chunk paths have no recording checks
+        if wave_file:
+            def write_input_audio(audio_bytes):
+                loop.run_in_executor(wave_executor, write_wave_frames, wave_file, audio_bytes)
+        else:
+            write_input_audio = no_audio_write
+        if output_wave_file:
+            def write_output_audio(audio_bytes):
+                loop.run_in_executor(wave_executor, write_wave_frames, output_wave_file, audio_bytes)
+        else:
+            write_output_audio = no_audio_write
+
         try:
             # Connect to Gemini using LiveAPI
-            async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
-                # Store session reference for tool calls
-                self.session = session
-                
+            async with client.aio.live.connect(model=MODEL, config=LIVE_CONFIG) as session:
                 # Track if we've already handled the initial session setup
                 session_initialized = False
                 
-                # Audio buffer for collecting chunks
-                audio_buffer = bytearray()
+                # Messages for the client; None tells the writer to stop
+                out_queue = asyncio.Queue()
                 
                 async with asyncio.TaskGroup() as tg:
                     
+                    async def send_run(run):
+                        """Send consecutive queued items of one kind as a single frame"""
+                        if isinstance(run[0], bytes):
+                            # Raw PCM chunks are concatenated into one tagged binary frame
+                            await self._send_audio(websocket, b"".join(run))
+                        elif len(run) == 1:
+                            await self._send_text(websocket, run[0])
+                        else:
+                            # Queued JSON items are already serialized, so they are just joined
+                            await self._send_text(websocket, '{"type":"batch","items":[' + ",".join(run) + ']}')
+                    
+                    # Task to send queued messages, several per WebSocket frame
+                    async def websocket_writer():
+                        while True:
+                            message = await out_queue.get()
+                            if message is None:
+                                return
+                            batch = [message]
+                            stop = False
+                            
+                            # Give the receive loop a moment to queue more messages
+                            if out_queue.empty():
+                                await asyncio.sleep(OUTBOUND_BATCH_WINDOW)
+                            while len(batch) < OUTBOUND_BATCH_MAX and not out_queue.empty():
+                                message = out_queue.get_nowait()
+                                if message is None:
+                                    stop = True
+                                    break
+                                batch.append(message)
+                            
+                            # Keep order: split the batch into runs of audio and JSON messages
+                            run = [batch[0]]
+                            for message in batch[1:]:
+                                if isinstance(message, bytes) == isinstance(run[0], bytes):
+                                    run.append(message)
+                                else:
+                                    await send_run(run)
+                                    run = [message]
+                            await send_run(run)
+                            if stop:
+                                return
+                    
                     # Task to process incoming WebSocket messages
                     async def handle_websocket_messages():
-                        nonlocal last_audio_time, turn_start_time, first_token_received, turn_count, audio_buffer
+                        nonlocal last_audio_time, turn_start_time, first_token_received
+                        
+                        async def forward_audio(audio_bytes):
+                            """Record a chunk of user audio and stream it to Gemini"""
+                            nonlocal last_audio_time
+                            # Update last audio time when we receive audio from user
+                            last_audio_time = time.monotonic()
+                            
+                            # --- Write to recording ---
+                            write_input_audio(audio_bytes)
+                            
+                            # Send audio immediately using NEW API FORMAT
+                            try:
+                                # model_construct skips pydantic validation; both fields are known-good
+                                await session.send_realtime_input(
+                                    audio=types.Blob.model_construct(
+                                        data=audio_bytes,
+                                        mime_type=AUDIO_MIME
+                                    )
+                                )
+                            except Exception as e:
+                                logger.error(f"Error sending audio to Gemini: {e}")
+                        
+                        async def on_start_test(data):
+                            nonlocal test_id
+                            test_id = data.get("test_id")
+                            print(f"Starting test: {test_id}")
+                        
+                        async def on_audio(data):
+                            # Older clients still send base64 audio in JSON
+                            await forward_audio(a2b_base64(data.get("data", "")))
+                        
+                        async def on_end(data):
+                            nonlocal turn_start_time, first_token_received
+                            # Client is done sending audio for this turn
+                            print(f"📨 RECEIVED END SIGNAL FROM CLIENT")
+                            logger.info("Received end signal from client")
+                            
+                            # Every chunk was already streamed; just mark the end of the audio stream
+                            try:
+                                await session.send_realtime_input(audio_stream_end=True)
+                            except Exception as e:
+                                logger.error(f"Error sending audio stream end: {e}")
+                            
+                            # Mark the start time for TTFT measurement
+                            if not turn_start_time:
+                                turn_start_time = time.monotonic()
+                                first_token_received = False
+                                print(f"🎤 USER FINISHED SPEAKING (END SIGNAL) - TTFT timer started at {turn_start_time:.3f}")
+                        
+                        async def on_text(data):
+                            # Handle text messages
+                            logger.info(f"Received text: {data.get('data')}")
+                        
+                        async def on_ping(data):
+                            # Handle ping messages to keep connection alive
+                            await self._send_text(websocket, PONG_MSG)
+                        
+                        # JSON control messages by type (audio normally arrives as binary frames)
+                        message_handlers = {
+                            "audio": on_audio,
+                            "end": on_end,
+                            "start_test": on_start_test,
+                            "text": on_text,
+                            "ping": on_ping,
+                        }
                         
                         try:
                             async for message in websocket:
                                 try:
-                                    data = json.loads(message)
-                                    if data.get("type") == "start_test":
-                                        self.current_test_id = data.get("test_id")
-                                        print(f"Starting test: {self.current_test_id}")
-                                    elif data.get("type") == "audio":
-                                        # Update last audio time when we receive audio from user
-                                        last_audio_time = time.time()
-                                        
-                                        # Decode base64 audio data
-                                        audio_bytes = base64.b64decode(data.get("data", ""))
-                                        
-                                        # --- Write to recording ---
-                                        if wave_file:
-                                            try:
-                                                wave_file.writeframes(audio_bytes)
-                                            except Exception as e:
-                                                print(f"❌ Error writing to wave file: {e}")
-                                        # --- End write ---
-                                        
-                                        # Add to buffer
-                                        audio_buffer.extend(audio_bytes)
-                                        
-                                        # Send audio immediately using NEW API FORMAT
-                                        try:
-                                            await session.send_realtime_input(
-                                                audio=types.Blob(
-                                                    data=audio_bytes,
-                                                    mime_type=f"audio/pcm;rate={SEND_SAMPLE_RATE}"
-                                                )
-                                            )
-                                        except Exception as e:
-                                            logger.error(f"Error sending audio to Gemini: {e}")
-                                        
-                                    elif data.get("type") == "end":
-                                        # Client is done sending audio for this turn
-                                        print(f"📨 RECEIVED END SIGNAL FROM CLIENT")
-                                        logger.info("Received end signal from client")
-                                        
-                                        # Send any remaining audio in buffer
-                                        if len(audio_buffer) > 0:
-                                            try:
-                                                await session.send_realtime_input(
-                                                    audio=types.Blob(
-                                                        data=bytes(audio_buffer),
-                                                        mime_type=f"audio/pcm;rate={SEND_SAMPLE_RATE}"
-                                                    )
-                                                )
-                                                print(f"📤 Sent final audio buffer: {len(audio_buffer)} bytes")
-                                                audio_buffer.clear()
-                                            except Exception as e:
-                                                logger.error(f"Error sending final audio buffer: {e}")
-                                        
-                                        # Mark the start time for TTFT measurement
-                                        if not turn_start_time:
-                                            turn_start_time = time.time()
-                                            first_token_received = False
-                                            print(f"🎤 USER FINISHED SPEAKING (END SIGNAL) - TTFT timer started at {turn_start_time:.3f}")
-                                            
-                                    elif data.get("type") == "text":
-                                        # Handle text messages
-                                        logger.info(f"Received text: {data.get('data')}")
+                                    # Binary frames carry tagged raw PCM - no base64 or JSON to decode
+                                    if isinstance(message, bytes):
+                                        if message[:1] == AUDIO_FRAME_TAG:
+                                            await forward_audio(message[1:])
+                                        continue
                                     
-                                    elif data.get("type") == "ping":
-                                        # Handle ping messages to keep connection alive
-                                        await self.safe_websocket_send(websocket, {"type": "pong"})
+                                    data = orjson.loads(message)
+                                    handler = message_handlers.get(data.get("type"))
+                                    if handler is not None:
+                                        await handler(data)
                                         
-                                except json.JSONDecodeError:
+                                except orjson.JSONDecodeError:
                                     logger.error("Invalid JSON message received")
                                 except Exception as e:
                                     logger.error(f"Error processing message: {e}")
@@ -299,62 +440,53 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
 
                                 # Use the same pattern as reference code
                                 turn = session.receive()
-                                model_transcription = "" # Accumulate transcription for the turn
                                 async for response in turn:
-                                    # Handle audio transcriptions
-                                    if response.server_content:
-                                        # Output transcription (model's speech to text)
-                                        if response.server_content.output_transcription:
-                                            transcript = response.server_content.output_transcription.text
-                                            if transcript and transcript.strip():
-                                                model_transcription += transcript + " "
-                                    
-                                    # Handle tool calls with WebSocket reference
-                                    if response.tool_call:
-                                        tool_called_this_turn = True
-                                        await self.handle_tool_calls(response, websocket, model_transcription)
-
+                                    # One monotonic timestamp for every timing in this response
+                                    now = time.monotonic()
                                     # Check if connection will be terminated soon
                                     if response.go_away is not None:
                                         logger.info(f"Session will terminate in: {response.go_away.time_left}")
 
+                                    # Resolve the response fields once; everything below uses these locals
                                     server_content = response.server_content
+                                    if server_content:
+                                        output_transcription = server_content.output_transcription
+                                        input_transcription = server_content.input_transcription
+                                        interrupted = server_content.interrupted
+                                        turn_complete = server_content.turn_complete
+                                    else:
+                                        output_transcription = input_transcription = None
+                                        interrupted = turn_complete = False
+                                    tool_call = response.tool_call
 
                                     # Handle interruption
-                                    if (hasattr(server_content, "interrupted") and server_content.interrupted):
+                                    if interrupted:
                                         logger.info("🤐 INTERRUPTION DETECTED")
-                                        await self.safe_websocket_send(websocket, {
-                                            "type": "interrupted",
-                                            "data": "Response interrupted by user input"
-                                        })
+                                        out_queue.put_nowait(INTERRUPTED_MSG)
 
                                     # Handle audio transcriptions
-                                    if response.server_content:
+                                    if server_content:
                                         # Output transcription (model's speech to text)
-                                        if response.server_content.output_transcription:
-                                            transcript = response.server_content.output_transcription.text
+                                        if output_transcription:
+                                            transcript = output_transcription.text
                                             if transcript and transcript.strip():
                                                 print(f"📝 AI said: '{transcript[:50]}...'")
                                                 logger.info(f"🎤 Model said: {transcript}")
-                                                output_transcriptions.append(transcript)
-                                                model_transcription += transcript + " "
+                                                output_transcriptions.append(transcript)  # Joined only when logged
                                                 
                                                 # Calculate TTFT for text
                                                 if turn_start_time and not first_token_received:
-                                                    ttft = (time.time() - turn_start_time) * 1000
+                                                    ttft = (now - turn_start_time) * 1000
                                                     print(f"📝 TURN {turn_count} - TIME TO FIRST TEXT TOKEN: {ttft:.2f}ms")
                                                     logger.info(f"📝 Time to First Text Token: {ttft:.2f}ms")
                                                     first_token_received = True
                                                 
                                                 # Send text to client
-                                                await self.safe_websocket_send(websocket, {
-                                                    "type": "otext",
-                                                    "data": transcript
-                                                })
+                                                out_queue.put_nowait(otext_message(transcript))
                                         
                                         # Input transcription (user's speech to text)
-                                        if response.server_content.input_transcription:
-                                            transcript = response.server_content.input_transcription.text
+                                        if input_transcription:
+                                            transcript = input_transcription.text
                                             if transcript and transcript.strip():
                                                 print(f"👤 User said: '{transcript}'")
                                                 logger.info(f"🗣️  You said: {transcript}")
@@ -362,66 +494,64 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                                                 
                                                 # When we get input transcription, user just finished speaking
                                                 if not turn_start_time and not first_token_received:
-                                                    turn_start_time = time.time()
+                                                    turn_start_time = now
                                                     turn_count += 1
                                                     print(f"🎤 TURN {turn_count}: User finished speaking (VAD detected) - TTFT timer started at {turn_start_time:.3f}")
                                                 
-                                                await self.safe_websocket_send(websocket, {
-                                                    "type": "itext",
-                                                    "data": transcript
-                                                })
+                                                out_queue.put_nowait(itext_message(transcript))
+
+                                    # Handle tool calls (after the transcription above, so it is included).
+                                    # Runs as its own task so audio keeps streaming while the tools execute;
+                                    # handle_tool_calls catches its own errors, so it cannot cancel the group.
+                                    # The task gets this connection's session and test_id as arguments, taken
+                                    # now, so nothing it reads can change before it runs
+                                    if tool_call:
+                                        tool_called_this_turn = True
+                                        tg.create_task(self.handle_tool_calls(session, response, websocket, test_id, " ".join(output_transcriptions)))
 
                                     # Handle audio data
                                     if data := response.data:
                                         # Calculate TTFT if this is the first token
                                         if turn_start_time and not first_token_received:
-                                            ttft = (time.time() - turn_start_time) * 1000
+                                            ttft = (now - turn_start_time) * 1000
                                             print(f"⚡ TURN {turn_count} - TIME TO FIRST AUDIO TOKEN: {ttft:.2f}ms")
                                             logger.info(f"⚡ Time to First Token: {ttft:.2f}ms")
                                             first_token_received = True
                                         
                                         # --- Write to output recording ---
-                                        if output_wave_file:
-                                            try:
-                                                output_wave_file.writeframes(data)
-                                            except Exception as e:
-                                                print(f"❌ Error writing to output wave file: {e}")
-                                        # --- End write ---
+                                        write_output_audio(data)
                                         
-                                        # Send audio to client
-                                        b64_audio = base64.b64encode(data).decode('utf-8')
-                                        await self.safe_websocket_send(websocket, {
-                                            "type": "audio",
-                                            "data": b64_audio
-                                        })
+                                        # Queue raw PCM for the client as a tagged binary frame (no base64/JSON).
+                                        # Every chunk goes through the queue, so audio keeps its place after the
+                                        # text queued before it; TTFT was already measured from `now` above
+                                        out_queue.put_nowait(data)
                                     elif text := response.text:
                                         # Handle any text responses
                                         logger.info(f"Text response: {text}")
 
                                     # Handle turn completion
-                                    if server_content and server_content.turn_complete:
+                                    if turn_complete:
+                                        # Tell the client first; logging below never delays turn_complete
+                                        out_queue.put_nowait(TURN_COMPLETE_MSG)
+                                        
                                         if not tool_called_this_turn:
                                             # If no tool was called, log a specific marker to maintain log integrity
                                             log_entry = {
-                                                "test_id": self.current_test_id,
+                                                "test_id": test_id,
                                                 "timestamp_utc": time.time(),
                                                 "tool_name": "NO_TOOL_CALLED",
                                                 "arguments": None,
                                                 "execution_time_ms": 0,
-                                                "model_response_transcription": model_transcription.strip()
+                                                "model_response_transcription": " ".join(output_transcriptions).strip()
                                             }
                                             try:
-                                                with open(config.SERVER_LOG_FILE, "a") as f:
-                                                    f.write(json.dumps(log_entry) + "\n")
+                                                LOG_QUEUE.put_nowait(orjson.dumps(log_entry) + b"\n")
                                                 print("📝 Logged NO_TOOL_CALLED marker.")
                                             except Exception as log_error:
                                                 print(f"❌ Failed to log NO_TOOL_CALLED marker: {log_error}")
-                                        else:
-                                            # Log the tool call just before the turn completes
-                                            await self.handle_tool_calls(response, websocket, model_transcription)
 
                                         if turn_start_time and first_token_received:
-                                            total_turn_time = (time.time() - turn_start_time) * 1000
+                                            total_turn_time = (now - turn_start_time) * 1000
                                             print(f"✅ TURN {turn_count} COMPLETE - Total response time: {total_turn_time:.2f}ms")
                                         else:
                                             print(f"✅ TURN {turn_count} COMPLETE - No timing data")
@@ -430,9 +560,6 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                                         # Reset TTFT tracking for next turn
                                         turn_start_time = None
                                         first_token_received = False
-                                        await self.safe_websocket_send(websocket, {
-                                            "type": "turn_complete"
-                                        })
                                         
                                         # --- START: Exit after one turn ---
                                         print("✅ Turn complete. Server is closing this session and is ready for the next connection.")
@@ -446,8 +573,12 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
                             logger.error(f"Error in receive_and_play: {e}")
                             print(f"⚠️ Session error, but continuing server operation: {e}")
                             # Don't crash the entire server, just log and continue
+                        finally:
+                            # Let the writer flush what is queued, then stop
+                            out_queue.put_nowait(None)
 
                     # Start tasks
+                    tg.create_task(websocket_writer())
                     tg.create_task(handle_websocket_messages())
                     tg.create_task(receive_and_play())
 
@@ -459,24 +590,34 @@ class LiveAPIWebSocketServer(BaseWebSocketServer):
             logger.error(f"Critical error in process_audio: {e}")
             print(f"❌ Critical error in audio processing: {e}")
             # Try to send error to client
-            await self.safe_websocket_send(websocket, {
-                "type": "error",
-                "data": f"Server error: {str(e)}"
-            })
+            await self._send_error(websocket, f"Server error: {str(e)}")
         finally:
             # --- Close Audio Recording ---
+            # Runs after any queued writes, since the executor has a single worker
             if wave_file:
-                wave_file.close()
+                await loop.run_in_executor(wave_executor, close_wave_file, wave_file, wave_fp)
                 print(f"✅ Finished recording input audio.")
             if output_wave_file:
-                output_wave_file.close()
+                await loop.run_in_executor(wave_executor, close_wave_file, output_wave_file, output_wave_fp)
                 print(f"✅ Finished recording model output audio.")
+            wave_executor.shutdown(wait=False)
             # --- End Close ---
 
+async def warm_up_client():
+    """Authenticate and open the HTTPS connection before the first client connects"""
+    warmup_start = time.monotonic_ns()
+    try:
+        # Any cheap authenticated call will do; the access token it fetches is reused by live.connect
+        await client.aio.models.get(model=MODEL)
+        print(f"🔥 Google client warmed up in {(time.monotonic_ns() - warmup_start) / 1e6:.2f}ms")
+    except Exception as e:
+        # Not fatal - the first session just pays for authentication itself
+        print(f"⚠️ Google client warm-up failed: {e}")
+
 async def main(save_audio: bool = True):
     """Main function to start the server"""
     # Calculate time to reach main execution
-    main_start_time = (time.time() - PROGRAM_START_TIME) * 1000
+    main_start_time = (time.monotonic_ns() - PROGRAM_START_TIME) / 1e6
     print(f"⏰ Reached main() in {main_start_time:.2f}ms")
     
     print("🚀 Starting WebSocket server with tools...")
@@ -486,8 +627,21 @@ async def main(save_audio: bool = True):
     print(f"🎵 Audio format: 16kHz PCM (Gemini Live compatible)")
     print(f"🔧 WebSocket: Fixed error handling and connection safety")
     
+    # Start the single background writer for tool call logs
+    log_writer_task = asyncio.create_task(log_writer(LOG_QUEUE))
+    
+    # Warm up in the background so the server starts listening right away
+    warmup_task = asyncio.create_task(warm_up_client())
+    
     server = LiveAPIWebSocketServer(save_audio_files=save_audio)
-    await server.start()
+    # Log records are written by this process's listener thread (started here, after any fork)
+    with queued_logging():
+        try:
+            await server.start()
+        finally:
+            # Stop the writer and write out anything still queued, so no log lines are lost on exit
+            log_writer_task.cancel()
+            flush_log_queue(LOG_QUEUE)
 
 if __name__ == "__main__":
     import argparse
@@ -496,7 +650,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     try:
-        asyncio.run(main(save_audio=args.save_audio))
+        get_runner()(main(save_audio=args.save_audio))
     except KeyboardInterrupt:
         logger.info("Exiting application via KeyboardInterrupt...")
     except Exception as e:
@@ -0,0 +1,44 @@
+# tools_registry.py - Lookups derived once from TOOLS_DEFINITION
+# tools.json is regenerated by generate_tool_data.py, so derived tables live here instead
+import functools
+
+import fastjsonschema
+
+from tools import TOOLS_DEFINITION
+
+
+# Each parameter schema is compiled once into plain Python checks (an invalid schema fails here, at import)
+TOOL_VALIDATORS = {tool["name"]: fastjsonschema.compile(tool["parameters"]) for tool in TOOLS_DEFINITION}
+
+
+def _argument_errors(name, args):
+    """Run the compiled validator for a tool call's arguments and return its errors"""
+    validator = TOOL_VALIDATORS.get(name)
+    if validator is None:
+        return [f"Unknown tool: {name}"]
+    try:
+        validator(args)
+    except fastjsonschema.JsonSchemaValueException as e:
+        # Generated validators stop at the first problem
+        return [e.message]
+    return []
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_argument_errors(name, frozen_args):
+    """Errors for an argument set seen before (voice sessions repeat the same commands)"""
+    return tuple(_argument_errors(name, {key: value for key, _, value in frozen_args}))
+
+
+def validate_tool_arguments(name, args):
+    """Return the schema errors for a tool call's arguments (an empty list when they are valid)"""
+    args = args or {}
+    try:
+        # The value's type is part of the key: True, 1 and 1.0 are equal (and hash the same)
+        # but a schema can accept one and reject another
+        frozen_args = tuple((key, type(value), value) for key, value in sorted(args.items()))
+        hash(frozen_args)
+    except TypeError:
+        # Nested lists/dicts are not hashable; validate those directly
+        return _argument_errors(name, args)
+    return list(_cached_argument_errors(name, frozen_args))
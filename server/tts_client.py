@@ -1,54 +1,111 @@
 # tts_client.py - A dedicated client for Google Cloud Text-to-Speech
+import asyncio
+import weakref
+from typing import AsyncIterator
+
 import config
+from config import logger
 from google.api_core.client_options import ClientOptions
 from google.cloud import texttospeech_v1beta1 as texttospeech
 
-def convert_text_to_audio(text: str) -> bytes:
-    """Synthesizes speech from text using Google Cloud's TTS API."""
-    try:
-        # Construct the correct API endpoint based on the location
-        api_endpoint = (
-            f"{config.TTS_LOCATION}-texttospeech.googleapis.com"
-            if config.TTS_LOCATION != "global"
-            else "texttospeech.googleapis.com"
-        )
-        client = texttospeech.TextToSpeechClient(
-            client_options=ClientOptions(api_endpoint=api_endpoint)
-        )
+# 1s of silence (16-bit mono) used to pad synthesized speech, allocated once
+SILENCE_PADDING = bytes(config.TTS_SAMPLE_RATE * 2)
 
-        # Construct the full voice name from the config
-        full_voice_name = f"{config.TTS_LANGUAGE_CODE}-Chirp3-HD-{config.TTS_VOICE_NAME}"
+# Request settings derived from config; they never change while the process runs
+API_ENDPOINT = (
+    f"{config.TTS_LOCATION}-texttospeech.googleapis.com"
+    if config.TTS_LOCATION != "global"
+    else "texttospeech.googleapis.com"
+)
+FULL_VOICE_NAME = f"{config.TTS_LANGUAGE_CODE}-Chirp3-HD-{config.TTS_VOICE_NAME}"
+VOICE_PARAMS = texttospeech.VoiceSelectionParams(
+    name=FULL_VOICE_NAME, language_code=config.TTS_LANGUAGE_CODE
+)
+AUDIO_CONFIG = texttospeech.AudioConfig(
+    audio_encoding=texttospeech.AudioEncoding[config.TTS_AUDIO_ENCODING],
+    sample_rate_hertz=config.TTS_SAMPLE_RATE
+)
+STREAMING_CONFIG = texttospeech.StreamingSynthesizeConfig(
+    voice=VOICE_PARAMS,
+    streaming_audio_config=texttospeech.StreamingAudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.PCM,
+        sample_rate_hertz=config.TTS_SAMPLE_RATE,
+    ),
+)
 
-        # Set up the synthesis request
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-        voice_params = texttospeech.VoiceSelectionParams(
-            name=full_voice_name, language_code=config.TTS_LANGUAGE_CODE
-        )
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding[config.TTS_AUDIO_ENCODING],
-            sample_rate_hertz=config.TTS_SAMPLE_RATE
+# One asyncio TTS client per event loop; an entry goes away with its loop
+_tts_clients = weakref.WeakKeyDictionary()
+
+
+def get_tts_client() -> texttospeech.TextToSpeechAsyncClient:
+    """
+    Returns the asyncio TTS client for the running event loop, created on first use there.
+
+    The gRPC channel belongs to the loop it was created on, so a later asyncio.run in
+    the same process gets a new client instead of one bound to a closed loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _tts_clients.get(loop)
+    if client is None:
+        client = texttospeech.TextToSpeechAsyncClient(
+            client_options=ClientOptions(api_endpoint=API_ENDPOINT)
         )
+        _tts_clients[loop] = client
+    return client
+
+async def synthesize_speech(text: str) -> bytes:
+    """Synthesizes speech from text without padding. Raises on API errors."""
+    client = get_tts_client()
+
+    # Set up the synthesis request (only the text changes between calls)
+    synthesis_input = texttospeech.SynthesisInput(text=text)
 
-        # Make the API call
-        print(f"🔊 Generating audio for: '{text[:40]}...'")
-        response = client.synthesize_speech(
-            input=synthesis_input, voice=voice_params, audio_config=audio_config
+    # Make the API call
+    logger.debug("🔊 Generating audio for: '%s...'", text[:40])
+    response = await client.synthesize_speech(
+        input=synthesis_input, voice=VOICE_PARAMS, audio_config=AUDIO_CONFIG
+    )
+    return response.audio_content
+
+
+async def iter_text_to_audio(text: str) -> AsyncIterator[bytes]:
+    """
+    Synthesizes speech from text and yields it as padded chunks.
+
+    Yields 1s of silence, the synthesized audio and 1s of silence, so callers can
+    send each part without first concatenating them. Raises on API errors.
+    """
+    audio = await synthesize_speech(text)
+
+    # --- START: Audio Padding ---
+    # Add 1s of silence padding at the beginning and end
+    yield SILENCE_PADDING
+    yield audio
+    yield SILENCE_PADDING
+    # --- END: Audio Padding ---
+
+
+async def stream_audio(text: str) -> AsyncIterator[bytes]:
+    """
+    Streams synthesized speech for text while it is being generated.
+
+    Uses the TTS bidirectional streaming API so callers can start sending audio
+    before synthesis has finished. Yields raw 16-bit PCM at TTS_SAMPLE_RATE with
+    the same 1s of silence padding as iter_text_to_audio. Raises on API errors.
+    """
+    client = get_tts_client()
+
+    async def requests():
+        # The first request carries the config, the following ones the text
+        yield texttospeech.StreamingSynthesizeRequest(streaming_config=STREAMING_CONFIG)
+        yield texttospeech.StreamingSynthesizeRequest(
+            input=texttospeech.StreamingSynthesisInput(text=text)
         )
-        
-        # --- START: Audio Padding ---
-        # Generate 3 seconds of silence by creating raw silent audio data.
-        # 16kHz, 16-bit mono audio means 16000 * 2 = 32000 bytes per second.
-        # 3 seconds of silence = 32000 * 3 = 96000 bytes of zeros.
-        silent_audio = b'\x00' * 32000
-        
-        print(f"Adding 1s of silence padding at the beginning and end.")
-        
-        # Combine the audio parts
-        padded_audio = silent_audio + response.audio_content + silent_audio
-        
-        return padded_audio
-        # --- END: Audio Padding ---
-
-    except Exception as e:
-        print(f"❌ TTS Client Error: {e}")
-        return None
+
+    logger.debug("🔊 Streaming audio for: '%s...'", text[:40])
+    yield SILENCE_PADDING
+    stream = await client.streaming_synthesize(requests=requests())
+    async for response in stream:
+        if response.audio_content:
+            yield response.audio_content
+    yield SILENCE_PADDING